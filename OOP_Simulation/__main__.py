@@ -2,139 +2,163 @@ from gravity_source import GravitySource as gs
 from light import Light
 import pygame
 from control_panel import ControlPanel as cp
+from sim_worker import SimulationWorker
+from path_compute import PathComputer
 import pygame_gui
 
-def simulate_full_path(light, gravity_source, max_frames, time_step):
-    for _ in range(max_frames):
-        light.move_due_to_gravity(gravity_source, time_step)
-        light.move_towards_direction(time_step)
-        light.update_direction(gravity_source)
-        if light.stopped:
-            break
-    return light.path
-
 def drag_gravity_source_with_mouse(gravity_source):
     gravity_source.set_position(pygame.mouse.get_pos())
 
 
 
 def main():
-    pygame.init()
-    pygame.display.set_caption("Gravity Simulation")
-    screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
-    clock = pygame.time.Clock()
-    manager = pygame_gui.UIManager((cp.WIDTH, cp.HEIGHT))
-
-    font = pygame.font.Font(None, 36)
-
     # Creating a gravity source with mass 3000 at the center of the screen
     gravity_source = gs(3000, (cp.WIDTH // 2, cp.HEIGHT // 2))
 
     # Creating a light object at an initial position
-    light = Light((cp.WIDTH // 4, cp.HEIGHT // 2 + 100), (1, 0))
-
-    if cp.MODE == 2:
-        light.path = simulate_full_path(light, gravity_source, cp.MAX_FRAMES, cp.TIME_STEP)
-
-    running = True
-    paused = False
-    frame_count = 0
-
-    # GUI elements with labels
-    width_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 10), (200, 30)), text="Width", manager=manager)
-    width_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 40), (200, 30)), start_value=cp.WIDTH, value_range=(400, 1600), manager=manager)
-
-    height_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 80), (200, 30)), text="Height", manager=manager)
-    height_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 110), (200, 30)), start_value=cp.HEIGHT, value_range=(300, 1200), manager=manager)
-
-    max_frames_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 150), (200, 30)), text="Max Frames", manager=manager)
-    max_frames_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 180), (200, 30)), start_value=cp.MAX_FRAMES, value_range=(1000, 20000000), manager=manager)
-
-    time_step_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 220), (200, 30)), text="Time Step", manager=manager)
-    time_step_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 250), (200, 30)), start_value=cp.TIME_STEP, value_range=(0.01, 1.0), manager=manager)
-
-    gravity_source_mass_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 270), (200, 30)), text="Gravity Source Mass", manager=manager)
-    gravity_source_mass_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 300), (200, 30)), start_value=gravity_source.mass, value_range=(1000, 10000), manager=manager)
-
-    gravity_source_radius_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 290), (200, 30)), text="Gravity Source Radius", manager=manager)
-    gravity_source_radius_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 320), (200, 30)), start_value=cp.GRAVITY_SOURCE_RADIUS, value_range=(5, 50), manager=manager)
-
-    light_radius_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 360), (200, 30)), text="Light Radius", manager=manager)
-    light_radius_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 390), (200, 30)), start_value=cp.LIGHT_RADIUS, value_range=(5, 50), manager=manager)
-
-    path_width_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 430), (200, 30)), text="Path Width", manager=manager)
-    path_width_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 460), (200, 30)), start_value=cp.PATH_WIDTH, value_range=(1, 10), manager=manager)
-
-    mode_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 500), (200, 30)), text="Mode (1: Real-time, 2: Full Path)", manager=manager)
-    mode_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 530), (200, 30)), start_value=cp.MODE, value_range=(1, 2), manager=manager)
-
-    pause_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((10, 570), (100, 30)), text='Pause', manager=manager)
-
-    while running:
-        time_delta = clock.tick(60) / 1000.0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            if event.type == pygame.USEREVENT:
-                if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
-                    if event.ui_element == pause_button:
-                        paused = not paused
-                        pause_button.set_text('Resume' if paused else 'Pause')
-
-            if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
-                if event.ui_element == width_slider:
-                    cp.WIDTH = int(width_slider.get_current_value())
-                    screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
-                elif event.ui_element == height_slider:
-                    cp.HEIGHT = int(height_slider.get_current_value())
-                    screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
-                elif event.ui_element == max_frames_slider:
-                    cp.MAX_FRAMES = int(max_frames_slider.get_current_value())
-                elif event.ui_element == time_step_slider:
-                    cp.TIME_STEP = float(time_step_slider.get_current_value())
-                elif event.ui_element == gravity_source_radius_slider:
-                    cp.GRAVITY_SOURCE_RADIUS = int(gravity_source_radius_slider.get_current_value())
-                elif event.ui_element == light_radius_slider:
-                    cp.LIGHT_RADIUS = int(light_radius_slider.get_current_value())
-                elif event.ui_element == path_width_slider:
-                    cp.PATH_WIDTH = int(path_width_slider.get_current_value())
-                elif event.ui_element == gravity_source_mass_slider:
-                    gravity_source.mass = int(gravity_source_mass_slider.get_current_value())
-                elif event.ui_element == mode_slider:
-                    cp.MODE = int(mode_slider.get_current_value())
-                    if cp.MODE == 2:
-                        light.path = simulate_full_path(light, gravity_source, cp.MAX_FRAMES, cp.TIME_STEP)
-
-            manager.process_events(event)
-
-        manager.update(time_delta)
-
-        screen.fill(cp.BACKGROUND_COLOR)
-
-        if not paused:
-            if cp.MODE == 1:
-                if frame_count < cp.MAX_FRAMES:
-                    light.move_due_to_gravity(gravity_source, cp.TIME_STEP)
-                    light.move_towards_direction(cp.TIME_STEP)
-                    light.update_direction(gravity_source)
-                    frame_count += 1
-
-                for i in range(len(light.path) - 1):
-                    pygame.draw.line(screen, cp.PATH_COLOR, light.path[i], light.path[i + 1], cp.PATH_WIDTH)
-
+    light_start, light_direction = (cp.WIDTH // 4, cp.HEIGHT // 2 + 100), (1, 0)
+    light = Light(light_start, light_direction)
+
+    # The real-time mode steps its own copy of the light in a background process.
+    # Started before pygame.init so the worker does not inherit the display.
+    worker = SimulationWorker(light, gravity_source, steps_per_second=None if cp.SIM_FAST else cp.SIM_STEPS_PER_SECOND)
+    fast = cp.SIM_FAST
+    # Full paths (MODE 2) are computed on a background thread, debounced over slider drags
+    path_computer = PathComputer()
+    try:
+        worker.start()
+
+        pygame.init()
+        pygame.display.set_caption("Gravity Simulation")
+        screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
+        clock = pygame.time.Clock()
+        manager = pygame_gui.UIManager((cp.WIDTH, cp.HEIGHT))
+
+        font = pygame.font.Font(None, 36)
+
+        def request_full_path():
             if cp.MODE == 2:
-                for i in range(len(light.path) - 1):
-                    pygame.draw.line(screen, cp.PATH_COLOR, light.path[i], light.path[i + 1], cp.PATH_WIDTH)
-
-        pygame.draw.circle(screen, cp.GRAVITY_SOURCE_COLOR, gravity_source.position, cp.GRAVITY_SOURCE_RADIUS)
-        pygame.draw.circle(screen, cp.LIGHT_COLOR, light.get_position(), cp.LIGHT_RADIUS)
-
-        manager.draw_ui(screen)
-
-        pygame.display.flip()
-
-    pygame.quit()
+                path_computer.request(light_start, light_direction, gravity_source, cp.MAX_FRAMES, cp.TIME_STEP)
+
+        request_full_path()
+
+        running = True
+        paused = False
+
+        # GUI elements with labels
+        width_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 10), (200, 30)), text="Width", manager=manager)
+        width_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 40), (200, 30)), start_value=cp.WIDTH, value_range=(400, 1600), manager=manager)
+
+        height_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 80), (200, 30)), text="Height", manager=manager)
+        height_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 110), (200, 30)), start_value=cp.HEIGHT, value_range=(300, 1200), manager=manager)
+
+        max_frames_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 150), (200, 30)), text="Max Frames", manager=manager)
+        max_frames_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 180), (200, 30)), start_value=cp.MAX_FRAMES, value_range=(1000, 20000000), manager=manager)
+
+        time_step_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 220), (200, 30)), text="Time Step", manager=manager)
+        time_step_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 250), (200, 30)), start_value=cp.TIME_STEP, value_range=(0.01, 1.0), manager=manager)
+
+        gravity_source_mass_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 270), (200, 30)), text="Gravity Source Mass", manager=manager)
+        gravity_source_mass_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 300), (200, 30)), start_value=gravity_source.mass, value_range=(1000, 10000), manager=manager)
+
+        gravity_source_radius_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 290), (200, 30)), text="Gravity Source Radius", manager=manager)
+        gravity_source_radius_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 320), (200, 30)), start_value=cp.GRAVITY_SOURCE_RADIUS, value_range=(5, 50), manager=manager)
+
+        light_radius_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 360), (200, 30)), text="Light Radius", manager=manager)
+        light_radius_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 390), (200, 30)), start_value=cp.LIGHT_RADIUS, value_range=(5, 50), manager=manager)
+
+        path_width_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 430), (200, 30)), text="Path Width", manager=manager)
+        path_width_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 460), (200, 30)), start_value=cp.PATH_WIDTH, value_range=(1, 10), manager=manager)
+
+        mode_label = pygame_gui.elements.UILabel(relative_rect=pygame.Rect((10, 500), (200, 30)), text="Mode (1: Real-time, 2: Full Path)", manager=manager)
+        mode_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((10, 530), (200, 30)), start_value=cp.MODE, value_range=(1, 2), manager=manager)
+
+        pause_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((10, 570), (100, 30)), text='Pause', manager=manager)
+
+        while running:
+            time_delta = clock.tick(60) / 1000.0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    # F toggles as-fast-as-possible stepping of the real-time worker
+                    fast = not fast
+                    worker.set_rate(None if fast else cp.SIM_STEPS_PER_SECOND)
+
+                if event.type == pygame.USEREVENT:
+                    if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
+                        if event.ui_element == pause_button:
+                            paused = not paused
+                            pause_button.set_text('Resume' if paused else 'Pause')
+                            worker.pause(paused)
+
+                if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
+                    if event.ui_element == width_slider:
+                        cp.WIDTH = int(width_slider.get_current_value())
+                        screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
+                    elif event.ui_element == height_slider:
+                        cp.HEIGHT = int(height_slider.get_current_value())
+                        screen = pygame.display.set_mode((cp.WIDTH, cp.HEIGHT))
+                    elif event.ui_element == max_frames_slider:
+                        cp.MAX_FRAMES = int(max_frames_slider.get_current_value())
+                        worker.set_max_steps(cp.MAX_FRAMES)
+                        request_full_path()
+                    elif event.ui_element == time_step_slider:
+                        cp.TIME_STEP = float(time_step_slider.get_current_value())
+                        worker.set_time_step(cp.TIME_STEP)
+                        request_full_path()
+                    elif event.ui_element == gravity_source_radius_slider:
+                        cp.GRAVITY_SOURCE_RADIUS = int(gravity_source_radius_slider.get_current_value())
+                    elif event.ui_element == light_radius_slider:
+                        cp.LIGHT_RADIUS = int(light_radius_slider.get_current_value())
+                    elif event.ui_element == path_width_slider:
+                        cp.PATH_WIDTH = int(path_width_slider.get_current_value())
+                    elif event.ui_element == gravity_source_mass_slider:
+                        gravity_source.mass = int(gravity_source_mass_slider.get_current_value())
+                        worker.set_mass(gravity_source.mass)
+                        request_full_path()
+                    elif event.ui_element == mode_slider:
+                        cp.MODE = int(mode_slider.get_current_value())
+                        if cp.MODE == 2:
+                            request_full_path()
+                        else:
+                            path_computer.cancel()
+
+                manager.process_events(event)
+
+            manager.update(time_delta)
+
+            screen.fill(cp.BACKGROUND_COLOR)
+
+            # Real-time mode shows the worker's latest snapshot; this never waits for it.
+            # Full-path mode shows the path computed so far by the current job.
+            job = path_computer.poll()
+            if cp.MODE == 1:
+                shown = worker.snapshot()
+            else:
+                shown = job if job is not None else light
+
+            if not paused:
+                path = shown.path
+                if len(path) > 1:
+                    pygame.draw.lines(screen, cp.PATH_COLOR, False, path, cp.PATH_WIDTH)
+
+            if cp.MODE == 2 and path_computer.busy:
+                text_surface = font.render("Computing path...", True, cp.TEXT_COLOR)
+                screen.blit(text_surface, (230, 10))
+
+            pygame.draw.circle(screen, cp.GRAVITY_SOURCE_COLOR, gravity_source.position, cp.GRAVITY_SOURCE_RADIUS)
+            pygame.draw.circle(screen, cp.LIGHT_COLOR, shown.get_position(), cp.LIGHT_RADIUS)
+
+            manager.draw_ui(screen)
+
+            pygame.display.flip()
+    finally:
+        # Also on errors, so the worker process and its shared memory do not outlive the window
+        path_computer.cancel()
+        worker.close()
+        pygame.quit()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -23,6 +23,11 @@ class ControlPanel:
     PATH_WIDTH = 2
     MAX_FRAMES = 2000  # Maximum number of frames for the real-time mode
     STOP_DISTANCE_THRESHOLD = 3 # Threshold distance to stop the light
+    SIM_STEPS_PER_SECOND = 60 # Pace of the real-time simulation worker, independent of the FPS
+    SIM_FAST = False # Start the worker in as-fast-as-possible mode (toggle with F)
+    PATH_CAPACITY = 1 << 16 # Path points shared by the worker before older ones are thinned
+    RECOMPUTE_DEBOUNCE = 0.25 # Seconds a slider must rest before the full path is recomputed
+    DEBUG_PRINT = False # Print the light position on every step (slows long runs down)
 
 
 
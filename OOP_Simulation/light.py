@@ -16,9 +16,10 @@ class Light:
         self.position[1] += pull_vector[1] * time_step
         self.path.append(tuple(self.position))  # Add the new position to the path
 
-        # Debugging output
         distance = self.distance_to_gravity_source(gravity_source)
-        print(f"Light Position: {self.position}, Distance to Gravity Source: {distance}")
+        # Debugging output
+        if cp.DEBUG_PRINT:
+            print(f"Light Position: {self.position}, Distance to Gravity Source: {distance}")
 
         # Check distance to gravity source
         if distance <= cp.STOP_DISTANCE_THRESHOLD:
@@ -0,0 +1,98 @@
+import threading
+import time
+from gravity_source import GravitySource
+from light import Light
+from control_panel import ControlPanel as cp
+
+CHUNK_STEPS = 1000  # steps between two cancellation checks / partial path updates
+
+
+def simulate_full_path(light, gravity_source, max_frames, time_step, cancelled=None, capacity=None):
+    """
+    Step light for up to max_frames steps and return its path.
+
+    cancelled is an optional threading.Event checked every CHUNK_STEPS steps. With a
+    capacity, a path longer than that is thinned to every other point (keeping the
+    last), so very long runs stay bounded in memory and drawing cost.
+    """
+    for start in range(0, max_frames, CHUNK_STEPS):
+        if cancelled is not None and cancelled.is_set():
+            break
+        for _ in range(min(CHUNK_STEPS, max_frames - start)):
+            light.move_due_to_gravity(gravity_source, time_step)
+            light.move_towards_direction(time_step)
+            light.update_direction(gravity_source)
+            if light.stopped:
+                break
+        if capacity is not None and len(light.path) > capacity:
+            light.path = light.path[:-1:2] + light.path[-1:]
+        if light.stopped:
+            break
+    return light.path
+
+
+class PathJob:
+    """One full-path computation on a daemon thread; path grows while it runs."""
+
+    def __init__(self, start, direction, mass, source_position, max_frames, time_step, capacity):
+        self.light = Light(start, direction)
+        self.gravity_source = GravitySource(mass, source_position)
+        self.max_frames = max_frames
+        self.time_step = time_step
+        self.capacity = capacity
+        self.cancelled = threading.Event()
+        self.done = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        simulate_full_path(self.light, self.gravity_source, self.max_frames, self.time_step,
+                           self.cancelled, self.capacity)
+        self.done = not self.cancelled.is_set()
+
+    @property
+    def path(self):
+        # The thread may rebind light.path when thinning; copy whatever list is current
+        return self.light.path[:]
+
+    def get_position(self):
+        return self.light.get_position()
+
+
+class PathComputer:
+    """
+    Debounced, cancellable full-path recomputation for the MODE 2 sliders.
+
+    request() cancels the running job at once and schedules a new one; poll(), called
+    every frame, starts it once no further request has arrived for debounce seconds,
+    so dragging a slider only computes the path for where it comes to rest. The
+    current job's path can be drawn while it is still being computed.
+    """
+
+    def __init__(self, debounce=cp.RECOMPUTE_DEBOUNCE, capacity=cp.PATH_CAPACITY):
+        self.debounce = debounce
+        self.capacity = capacity
+        self.job = None
+        self._pending = None
+        self._deadline = 0.0
+
+    def request(self, start, direction, gravity_source, max_frames, time_step):
+        self.cancel()
+        self._pending = (start, direction, gravity_source.mass, tuple(gravity_source.position), max_frames, time_step)
+        self._deadline = time.monotonic() + self.debounce
+
+    def poll(self):
+        if self._pending is not None and time.monotonic() >= self._deadline:
+            self.job = PathJob(*self._pending, capacity=self.capacity)
+            self._pending = None
+            self.job.thread.start()
+        return self.job
+
+    @property
+    def busy(self):
+        return self._pending is not None or (self.job is not None and self.job.thread.is_alive())
+
+    def cancel(self):
+        # Drops a scheduled job too, so switching back to MODE 1 mid-debounce starts nothing
+        self._pending = None
+        if self.job is not None:
+            self.job.cancelled.set()
@@ -0,0 +1,119 @@
+import os
+import sys
+from control_panel import ControlPanel as cp
+
+# The worker plumbing is shared with Pygame_Base_cone; make the repository root importable
+_proj_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _proj_root not in sys.path:
+    sys.path.insert(0, _proj_root)
+
+from pygame_common import shared_worker
+
+
+class LightSnapshot:
+    """Consistent copy of the worker's light: position, (points, 2) path, steps and stopped."""
+
+    def __init__(self, position, path, steps, stopped):
+        self.position = position
+        self.path = path
+        self.steps = steps
+        self.stopped = stopped
+
+    def get_position(self):
+        return self.position
+
+    @classmethod
+    def copy(cls, arrays):
+        return cls(
+            tuple(arrays["position"]), arrays["path"][:arrays["path_len"]].copy(),
+            int(arrays["steps"]), bool(arrays["stopped"]),
+        )
+
+
+class LightSimulation(shared_worker.Simulation):
+    """
+    One Light stepped around a GravitySource, publishing its position and up to
+    capacity (x, y) path points. When the shared path fills up it is thinned in place
+    to every other point, so long runs keep their shape within a fixed block.
+    """
+
+    def __init__(self, light, gravity_source, time_step, max_steps, capacity):
+        self.light = light
+        self.gravity_source = gravity_source
+        self.time_step = time_step
+        self.max_steps = max_steps
+        self.capacity = capacity
+        self.steps = 0
+
+    def layout(self):
+        return {
+            "position": ((2,), "f8"),
+            "path": ((self.capacity, 2), "f8"),
+            "path_len": ((), "i8"),
+            "steps": ((), "i8"),
+            "stopped": ((), "?"),
+        }
+
+    def finished(self):
+        return self.steps >= self.max_steps or self.light.stopped
+
+    def command(self, name, value):
+        if name == "mass":
+            self.gravity_source.mass = value
+        elif name == "time_step":
+            self.time_step = value
+        elif name == "max_steps":
+            self.max_steps = value
+        else:
+            super().command(name, value)
+
+    def publish(self, state):
+        with state.writing() as arrays:
+            path, path_len = arrays["path"], int(arrays["path_len"])
+            # The first point of light.path was published with the previous batch
+            new_points = self.light.path[1:] if path_len else self.light.path
+            for start in range(0, len(new_points), self.capacity // 2):
+                chunk = new_points[start:start + self.capacity // 2]
+                while path_len + len(chunk) > self.capacity:
+                    path_len = (path_len + 1) // 2
+                    path[:path_len] = path[:2 * path_len:2].copy()
+                path[path_len:path_len + len(chunk)] = chunk
+                path_len += len(chunk)
+            arrays["position"][:] = self.light.position
+            arrays["path_len"][()] = path_len
+            arrays["steps"][()] = self.steps
+            arrays["stopped"][()] = self.light.stopped
+
+    def advance(self, steps, state):
+        for _ in range(min(steps, self.max_steps - self.steps)):
+            self.light.move_due_to_gravity(self.gravity_source, self.time_step)
+            self.light.move_towards_direction(self.time_step)
+            self.light.update_direction(self.gravity_source)
+            self.steps += 1
+        self.publish(state)
+        # The Light records its own path; keep only the point the next batch continues from
+        self.light.path = self.light.path[-1:]
+
+    def read(self, state):
+        return state.read(LightSnapshot.copy)
+
+
+class SimulationWorker(shared_worker.SimulationWorker):
+    """
+    Steps a Light around a GravitySource in a separate process (see
+    pygame_common.shared_worker). Slider changes reach the running worker through
+    set_mass, set_time_step and set_max_steps.
+    """
+
+    def __init__(self, light, gravity_source, time_step=cp.TIME_STEP, max_steps=cp.MAX_FRAMES,
+                 steps_per_second=cp.SIM_STEPS_PER_SECOND, capacity=cp.PATH_CAPACITY):
+        super().__init__(LightSimulation(light, gravity_source, time_step, max_steps, capacity), steps_per_second)
+
+    def set_mass(self, mass):
+        self.send("mass", mass)
+
+    def set_time_step(self, time_step):
+        self.send("time_step", time_step)
+
+    def set_max_steps(self, max_steps):
+        self.send("max_steps", max_steps)
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import sys
+import numpy as np
+from parameters import *
+from gravity_source import GravitySource as gs
+from anti_gravity_source import AntiGravitySource as ags
+from light import Light
+from light_scatter import LightScatter, polar_to_cartesian
+from source_field import SourceField
+
+# Largest distance (pixels) allowed between the two simulations over the compared frames
+TOLERANCE = 0.5
+
+
+def scene_pairs():
+    """The (gravity, anti-gravity) rows of __main__."""
+    gravity_positions = np.arange(0, 950, 100)
+    anti_gravity_positions = np.arange(50, 900, 100)
+    rows = (
+        (300, gravity_positions, anti_gravity_positions),
+        (350, anti_gravity_positions, gravity_positions),
+        (400, gravity_positions, anti_gravity_positions),
+    )
+    return [(gs(MASS, (g_pos, y)), ags(MASS, (ag_pos, y))) for y, gs_row, ags_row in rows for g_pos, ag_pos in zip(gs_row, ags_row)]
+
+
+def compare(frames=20):
+    """
+    Step the original per-Light sweep (every ray once per source, one source at a time)
+    next to LightScatter for frames frames; returns the largest distance between them.
+    """
+    pairs = scene_pairs()
+    field = SourceField.from_pairs(pairs)
+    lights = [Light(origin, polar_to_cartesian(R, theta)) for origin in SCATTER_ORIGINS for theta in THETA]
+    scatter = LightScatter(SCATTER_ORIGINS, record=False)
+    worst = 0.0
+    for _ in range(frames):
+        with contextlib.redirect_stdout(io.StringIO()):  # Light prints every stop
+            for pair in pairs:
+                for source in pair:
+                    for light in lights:
+                        if not light.stopped:
+                            light.move_due_to_gravity(source, TIME_STEP)
+                            light.move_towards_direction(TIME_STEP)
+                            light.update_direction(source)
+        for _ in range(STEPS_PER_FRAME):
+            scatter.update(field, TIME_STEP)
+        expected = np.array([light.position for light in lights])
+        worst = max(worst, float(np.linalg.norm(expected - scatter.positions, axis=1).max()))
+    return worst
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    worst = compare(frames)
+    print(f"Largest deviation from the original sweep over {frames} frames: {worst:.4g} px")
+    if worst > TOLERANCE:
+        sys.exit(1)
@@ -2,6 +2,8 @@ import numpy as np
 import math
 
 class GravitySource:
+    charge = 1  # sign of the pull, used by source_field.SourceField
+
     def __init__(self, mass, position):
         self.mass = mass
         self.position = np.array(position, dtype=float)
@@ -1,8 +1,8 @@
-from light import Light
 import pygame
 from parameters import *
 import math
 import numpy as np
+from viewport import draw_circles
 
 def polar_to_cartesian(r, theta):
     x = r * math.cos(math.radians(theta))
@@ -10,32 +10,88 @@ def polar_to_cartesian(r, theta):
     return (x, y)
 
 class LightScatter:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.lights = {}
-        for i in THETA:
-            self.lights[i] = Light((self.x, self.y), polar_to_cartesian(R, i))
-
-    def update(self, gravity_source, time_step):
-        for light in self.lights.values():
-            if not light.stopped:
-                light.move_due_to_gravity(gravity_source, time_step)
-                light.move_towards_direction(time_step)
-                light.update_direction(gravity_source)
-        
-    def draw(self, screen, transform, zoom, font, frame):
-        for light in self.lights.values():
-            # Draw the light
-            pygame.draw.circle(screen, LIGHT_COLOR, transform((int(light.get_position()[0]), int(light.get_position()[1]))), int(LIGHT_RADIUS * zoom))
-
-            # Draw the path of the light
-            if len(light.path) > 1:
-                transformed_path = [transform(point) for point in light.path]
-                pygame.draw.lines(screen, PATH_COLOR, False, transformed_path, max(1, int(PATH_WIDTH * zoom)))
-
-    def draw_text(self, screen, font, frame):
-        # Prepare textual information
-        text_surface = font.render(f"Light Position: {frame}", True, TEXT_COLOR)
-        # Blit the text onto the screen
-        screen.blit(text_surface, (10, 30))
+    """
+    Every scatter of the scene in one set of arrays: each origin fans out one ray per
+    THETA angle, and all rays of all scatters live in shared (rays, 2) position and
+    direction arrays, so a step is a single vectorized evaluation against a
+    source_field.SourceField however many scatters there are.
+
+    Paths are kept in a growing (steps, rays, 2) float32 array instead of per-ray
+    lists of tuples; path_len steps of it are valid. With record=False only the
+    starting row is kept (sim_worker records the path itself).
+    """
+
+    def __init__(self, origins, record=True):
+        self.origins = np.array(origins, dtype=np.float64).reshape(-1, 2)
+        angles = np.radians(np.array(list(THETA), dtype=np.float64))
+        fan = R * np.column_stack([np.cos(angles), np.sin(angles)])
+        self.n_theta = len(angles)
+
+        self.positions = np.repeat(self.origins, self.n_theta, axis=0)
+        self.directions = np.tile(fan, (len(self.origins), 1))
+        self.stopped = np.zeros(len(self.positions), dtype=bool)
+        self._acc = None         # pull at the current positions, carried between steps
+        self._acc_field = None
+
+        self.record = record
+        self.path = np.empty((256 if record else 1, len(self.positions), 2), dtype=np.float32)
+        self.path[0] = self.positions
+        self.path_len = 1
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _record(self):
+        if self.path_len == len(self.path):
+            grown = np.empty((2 * len(self.path),) + self.path.shape[1:], dtype=self.path.dtype)
+            grown[:self.path_len] = self.path[:self.path_len]
+            self.path = grown
+        self.path[self.path_len] = self.positions
+        self.path_len += 1
+
+    def update(self, field, time_step):
+        """
+        One step of every moving ray against all sources of field at once.
+
+        The original loop stepped each ray once per source with only that source's
+        pull, so a step here applies the field's pull divided by len(field): the
+        len(field) steps of a frame bend and drift the rays as much as one sweep
+        over the sources did.
+        """
+        share = 1.0 / max(len(field), 1)
+        if self._acc is None or self._acc_field is not field:
+            self._acc = field.accelerations(self.positions) * share
+            self._acc_field = field
+        moving = np.flatnonzero(~self.stopped)
+        pos = self.positions[moving]
+        pos += self._acc[moving] * time_step
+        pos += self.directions[moving] * time_step
+        # The pull at the new position bends the direction and is reused as the next step's pull
+        acc, nearest = field.evaluate(pos)
+        acc *= share
+        self.directions[moving] += acc
+        self._acc[moving] = acc
+        self.positions[moving] = pos
+        self.stopped[moving] = nearest <= STOP_DISTANCE_THRESHOLD
+        if self.record:
+            self._record()
+
+    def ray_paths(self):
+        """(steps, rays, 2) view of the recorded path."""
+        return self.path[:self.path_len]
+
+    def draw(self, screen, viewport):
+        # Paths are drawn incrementally by trail_layer.TrailLayer; only the lights are drawn here
+        draw_lights(screen, self.positions, viewport)
+
+
+def draw_lights(screen, positions, viewport):
+    """Light dots at (rays, 2) positions, e.g. of a sim_worker.RaySnapshot, culled to the viewport."""
+    draw_circles(screen, positions, LIGHT_COLOR, LIGHT_RADIUS, viewport)
+
+
+def draw_text(screen, font, frame):
+    # Prepare textual information
+    text_surface = font.render(f"Light Position: {frame}", True, TEXT_COLOR)
+    # Blit the text onto the screen
+    screen.blit(text_surface, (10, 30))
@@ -16,4 +16,9 @@ STOP_DISTANCE_THRESHOLD = 10  # Threshold distance to stop the light
 ANTI_GRAVITY_SOURCE_COLOR = (0, 255, 255)
 MODE = 1 # 1 for real-time, 2 for full path
 R = 10
+STEPS_PER_FRAME = 54  # Physics steps per frame: the original loop stepped every ray once per source (27 pairs x 2)
+SIM_STEPS_PER_SECOND = 60 * STEPS_PER_FRAME  # Pace of the simulation worker, independent of the FPS
+SIM_FAST = False  # Start the worker in as-fast-as-possible mode (toggle with F)
+PATH_RECORD_EVERY = 27  # Worker steps per recorded path vertex (two per frame)
+SCATTER_ORIGINS = [(x, 100) for x in range(50, 800, 100)]  # One light scatter per origin
 THETA = range(30, 150, 5)
\ No newline at end of file
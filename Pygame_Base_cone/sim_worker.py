@@ -0,0 +1,101 @@
+import os
+import sys
+from parameters import *
+from light_scatter import LightScatter
+
+# The worker plumbing is shared with OOP_Simulation; make the repository root importable
+_proj_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _proj_root not in sys.path:
+    sys.path.insert(0, _proj_root)
+
+from pygame_common import shared_worker
+
+
+class RaySnapshot:
+    """
+    Consistent copy of the worker's published rays. ray_paths() and path_len match
+    LightScatter, so trail_layer.TrailLayer draws a snapshot the same way.
+    """
+
+    def __init__(self, state, positions, stopped, steps, path_len):
+        self._state = state
+        self.positions = positions
+        self.stopped = stopped
+        self.steps = steps
+        self.path_len = path_len
+
+    def __len__(self):
+        return len(self.positions)
+
+    def ray_paths(self):
+        """(path_len, rays, 2) view of the shared path; rows below path_len never change."""
+        return self._state.arrays["path"][:self.path_len]
+
+
+class ScatterSimulation(shared_worker.Simulation):
+    """
+    The light scatter of origins against field, recording every record_every-th step
+    into a (capacity, rays, 2) float32 shared path. Path rows are append-only and a row
+    is written before path_len is raised past it, so they are read without the lock.
+    """
+
+    def __init__(self, field, origins, time_step, max_steps, record_every):
+        self.field = field
+        self.scatter = LightScatter(origins, record=False)
+        self.time_step = time_step
+        self.max_steps = max_steps
+        self.record_every = record_every
+        self.steps = 0
+
+    def layout(self):
+        rays = len(self.scatter)
+        return {
+            "positions": ((rays, 2), "f8"),
+            "stopped": ((rays,), "?"),
+            "steps": ((), "i8"),
+            "path_len": ((), "i8"),
+            "path": ((self.max_steps // self.record_every + 1, rays, 2), "f4"),
+        }
+
+    def finished(self):
+        return self.steps >= self.max_steps or self.scatter.stopped.all()
+
+    def _record(self, state):
+        arrays = state.arrays
+        path_len = int(arrays["path_len"])
+        if path_len < len(arrays["path"]):
+            arrays["path"][path_len] = self.scatter.positions
+            arrays["path_len"][()] = path_len + 1
+
+    def publish(self, state):
+        if self.steps == 0:
+            self._record(state)   # the launch positions start every path
+        with state.writing() as arrays:
+            arrays["positions"][:] = self.scatter.positions
+            arrays["stopped"][:] = self.scatter.stopped
+            arrays["steps"][()] = self.steps
+
+    def advance(self, steps, state):
+        for _ in range(min(steps, self.max_steps - self.steps)):
+            self.scatter.update(self.field, self.time_step)
+            self.steps += 1
+            if self.steps % self.record_every == 0:
+                self._record(state)
+        self.publish(state)
+
+    def read(self, state):
+        return state.read(lambda arrays: RaySnapshot(
+            state, arrays["positions"].copy(), arrays["stopped"].copy(),
+            int(arrays["steps"]), int(arrays["path_len"]),
+        ))
+
+
+class SimulationWorker(shared_worker.SimulationWorker):
+    """
+    Runs the light scatter of origins against field in a separate process (see
+    pygame_common.shared_worker). snapshot() returns a RaySnapshot.
+    """
+
+    def __init__(self, field, origins, time_step=TIME_STEP, max_steps=MAX_FRAMES * STEPS_PER_FRAME,
+                 steps_per_second=SIM_STEPS_PER_SECOND, record_every=PATH_RECORD_EVERY):
+        super().__init__(ScatterSimulation(field, origins, time_step, max_steps, record_every), steps_per_second)
@@ -0,0 +1,68 @@
+import pygame
+import numpy as np
+from parameters import *
+from viewport import PathLOD, visible_runs
+
+
+class TrailLayer:
+    """
+    Persistent off-screen surface holding the drawn paths of a LightScatter.
+
+    Each frame only the path segments recorded since the previous frame are drawn
+    onto the surface, and the surface is blitted whole, so frame time no longer
+    grows with simulated time. When the view (pan offset or zoom) changes the
+    surface is redrawn from the PathLOD polylines of the current zoom, keeping only
+    the rays and segment runs that touch the window.
+    """
+
+    def __init__(self, size, color=PATH_COLOR):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.size = size
+        self.color = color
+        self.view = None
+        self.drawn_steps = 0    # path steps already on the surface
+        self.lod = PathLOD()
+
+    def _width(self, viewport):
+        return max(1, int(PATH_WIDTH * viewport.zoom))
+
+    def _draw_steps(self, scatter, first, viewport):
+        # Segments from step first - 1 onwards; rays that did not move or stay off-screen are skipped
+        paths = scatter.ray_paths()[max(first - 1, 0):]
+        if len(paths) < 2:
+            return
+        width = self._width(viewport)
+        lo, hi = viewport.world_bounds(width)
+        moved = (paths[1:] != paths[:-1]).any(axis=(0, 2))
+        touching = ((paths.max(axis=0) >= lo) & (paths.min(axis=0) <= hi)).all(axis=1)
+        rays = np.flatnonzero(moved & touching)
+        if len(rays):
+            screen_paths = viewport.to_screen(paths[:, rays])
+            for column in range(len(rays)):
+                pygame.draw.lines(self.surface, self.color, False, screen_paths[:, column].tolist(), width)
+
+    def _rebuild(self, scatter, viewport):
+        simplified = self.lod.paths(scatter, viewport.zoom)
+        width = self._width(viewport)
+        lo, hi = viewport.world_bounds(width)
+        # The simplified polylines may stop short of the newest row by less than a pixel
+        last = scatter.ray_paths()[-1]
+        touching = ((simplified.hi >= lo) & (simplified.lo <= hi)).all(axis=1)
+        for ray in np.flatnonzero(touching):
+            points = viewport.to_screen(np.concatenate((simplified.polyline(ray), last[ray][None])))
+            for run in visible_runs(points, self.size, width):
+                pygame.draw.lines(self.surface, self.color, False, run.tolist(), width)
+
+    def update(self, scatter, viewport):
+        steps = scatter.path_len
+        if viewport.view != self.view or steps < self.drawn_steps:
+            # Pan or zoom changed (or the path restarted): the cached pixels are stale
+            self.surface.fill((0, 0, 0, 0))
+            self.view = viewport.view
+            self._rebuild(scatter, viewport)
+        elif steps > self.drawn_steps:
+            self._draw_steps(scatter, self.drawn_steps, viewport)
+        self.drawn_steps = steps
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
@@ -0,0 +1,148 @@
+import math
+import numpy as np
+import pygame
+from parameters import *
+
+LOD_CACHE_LEVELS = 4   # simplified path levels kept, one per power-of-two zoom band
+
+
+def lod_level(zoom):
+    """Power-of-two level whose cell of 2**level world units is at most one screen pixel."""
+    return math.floor(-math.log2(zoom))
+
+
+def visible_runs(points, size, margin=0):
+    """Runs of consecutive (n, 2) screen points whose segments touch the window."""
+    if len(points) < 2:
+        return []
+    lo = np.minimum(points[:-1], points[1:])
+    hi = np.maximum(points[:-1], points[1:])
+    width, height = size
+    touching = (
+        (hi[:, 0] >= -margin) & (lo[:, 0] <= width + margin)
+        & (hi[:, 1] >= -margin) & (lo[:, 1] <= height + margin)
+    )
+    edges = np.diff(np.concatenate(([0], touching.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [points[start:end + 1] for start, end in zip(starts, ends)]
+
+
+class Viewport:
+    """
+    The window's pan offset and zoom, with the mapping of __main__'s old transform()
+    closure: screen = (world + offset) * zoom, truncated to integer pixels.
+    """
+
+    def __init__(self, offset_x, offset_y, zoom, size=(WIDTH, HEIGHT)):
+        self.offset = np.array([offset_x, offset_y], dtype=np.float64)
+        self.zoom = zoom
+        self.size = size
+
+    @property
+    def view(self):
+        return (float(self.offset[0]), float(self.offset[1]), self.zoom)
+
+    def to_screen(self, points):
+        return ((np.asarray(points) + self.offset) * self.zoom).astype(int)
+
+    def world_bounds(self, margin=0):
+        """(min, max) world corners of the window grown by margin screen pixels."""
+        pad = margin / self.zoom
+        lo = -self.offset - pad
+        hi = np.array(self.size) / self.zoom - self.offset + pad
+        return lo, hi
+
+    def visible(self, points, margin=0):
+        """Mask of the (n, 2) world points inside the window grown by margin pixels."""
+        lo, hi = self.world_bounds(margin)
+        points = np.asarray(points)
+        return ((points >= lo) & (points <= hi)).all(axis=-1)
+
+
+def draw_circles(screen, positions, color, radius, viewport):
+    """Circles of world radius at positions, skipping off-screen and sub-pixel ones."""
+    radius = int(radius * viewport.zoom)
+    if radius < 1 or not len(positions):
+        return  # pygame draws nothing below one pixel anyway
+    positions = np.asarray(positions).reshape(-1, 2)
+    for center in viewport.to_screen(positions[viewport.visible(positions, radius)]).tolist():
+        pygame.draw.circle(screen, color, center, radius)
+
+
+def draw_sources(screen, field, viewport):
+    """Gravity and anti-gravity sources of a source_field.SourceField, culled to the window."""
+    gravity = field.signed_masses >= 0
+    draw_circles(screen, field.positions[gravity], GRAVITY_SOURCE_COLOR, GRAVITY_SOURCE_RADIUS, viewport)
+    draw_circles(screen, field.positions[~gravity], ANTI_GRAVITY_SOURCE_COLOR, GRAVITY_SOURCE_RADIUS, viewport)
+
+
+class SimplifiedPaths:
+    """
+    Per-ray polylines of a recorded (steps, rays, 2) path simplified on a grid of
+    side cell: a vertex is kept only when it lies in a different cell than the vertex
+    before it. With a cell of at most one screen pixel a ray keeps about one vertex
+    per pixel it crosses. extend() processes only the rows added since the last call,
+    and each ray's world bounding box is kept for culling.
+    """
+
+    def __init__(self, cell, n_rays):
+        self.cell = cell
+        self.n_rays = n_rays
+        self.built = 0    # path rows processed
+        self.vertices = [np.empty((64, 2), dtype=np.float32) for _ in range(n_rays)]
+        self.lengths = np.zeros(n_rays, dtype=np.intp)
+        self.lo = np.full((n_rays, 2), np.inf)
+        self.hi = np.full((n_rays, 2), -np.inf)
+        self._last_cells = None
+
+    def extend(self, paths):
+        rows = paths[self.built:]
+        if not len(rows):
+            return
+        cells = np.floor(rows / self.cell).astype(np.int64)
+        keep = np.empty(cells.shape[:2], dtype=bool)
+        keep[1:] = (cells[1:] != cells[:-1]).any(axis=2)
+        keep[0] = True if self._last_cells is None else (cells[0] != self._last_cells).any(axis=1)
+        self._last_cells = cells[-1]
+        self.built = len(paths)
+
+        for ray in np.flatnonzero(keep.any(axis=0)):
+            new = rows[keep[:, ray], ray]
+            end = self.lengths[ray] + len(new)
+            if end > len(self.vertices[ray]):
+                grown = np.empty((max(end, 2 * len(self.vertices[ray])), 2), dtype=np.float32)
+                grown[:self.lengths[ray]] = self.vertices[ray][:self.lengths[ray]]
+                self.vertices[ray] = grown
+            self.vertices[ray][self.lengths[ray]:end] = new
+            self.lengths[ray] = end
+        self.lo = np.minimum(self.lo, np.where(keep[..., None], rows, np.inf).min(axis=0))
+        self.hi = np.maximum(self.hi, np.where(keep[..., None], rows, -np.inf).max(axis=0))
+
+    def polyline(self, ray):
+        return self.vertices[ray][:self.lengths[ray]]
+
+
+class PathLOD:
+    """
+    SimplifiedPaths of one recorded path per zoom level (see lod_level), so pans reuse
+    the polylines of the current zoom and zooming back to a recent level only extends
+    them. The LOD_CACHE_LEVELS most recently used levels are kept.
+    """
+
+    def __init__(self, max_levels=LOD_CACHE_LEVELS):
+        self.max_levels = max_levels
+        self.levels = {}    # level -> SimplifiedPaths, least recently used first
+
+    def paths(self, scatter, zoom):
+        """Simplified polylines of scatter.ray_paths() for zoom, brought up to date."""
+        level = lod_level(zoom)
+        paths = scatter.ray_paths()
+        simplified = self.levels.pop(level, None)
+        if simplified is None or simplified.built > len(paths) or simplified.n_rays != paths.shape[1]:
+            simplified = SimplifiedPaths(2.0 ** level, paths.shape[1])
+        self.levels[level] = simplified
+        while len(self.levels) > self.max_levels:
+            del self.levels[next(iter(self.levels))]
+        simplified.extend(paths)
+        return simplified
@@ -21,6 +21,21 @@ class ControlPanel:
     STOP_DISTANCE_THRESHOLD = 3 # Threshold distance to stop the light
     EARTH_RADIUS = 2
     EARTH_COLOR = (0, 100, 255)
+    PHYSICS_SUBSTEP = 1 / 120  # Fixed physics step of the hand-built scenes; spec scenes use physics.dt
+    INTEGRATOR = "euler"  # "euler", "leapfrog" (long runs, larger steps) or "rk45" (adaptive); spec scenes use physics.integrator
+    SCENE_OVERRIDES = {}  # Dotted spec settings applied over the scene file, e.g. {"physics.backend": "octree"}; headless --set does the same
+    LIGHT_CLOUD_POINT_SIZE = 8  # Point size of the batched light cloud
+    TRAIL_CAPACITY = 1024  # Samples kept per ray trail (None keeps the whole path)
+    TRAIL_DECIMATION = 2  # Store every n-th frame in the trails
+    SOURCE_VISUAL_MODE = "full"  # "full" spheres, "lowpoly" shared spheres, "merged" single point cloud; scenes may opt into the cheaper ones
+    SOURCE_SPHERE_RESOLUTION = (12, 8)  # (u, v) sphere resolution outside "full" mode
+    SOURCE_POINT_SIZE = 20  # Point size of the merged source cloud
+    USE_RESULT_CACHE = False  # Opt in to reuse simulated trajectories while the scene physics is unchanged
+    RESULT_CACHE_DIR = None  # None uses $SIM_CACHE_DIR or ~/.cache/manim3d_simulator
+    RESULT_CACHE_MAX_MB = 2048  # Least recently used results are evicted beyond this size
+    CHECKPOINT_DIR = None  # Directory for periodic checkpoints of spec scenes, resumed on the next render; None disables them
+    CHECKPOINT_INTERVAL = 600  # Physics steps between checkpoints
+    CHECKPOINT_KEEP = 3  # Newest checkpoints retained
 
     def construct(self):
         # Screen settings
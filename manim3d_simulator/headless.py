@@ -0,0 +1,136 @@
+"""
+Simulate a scene spec without Manim.
+
+    python -m manim3d_simulator.headless manim3d_simulator/scenes/cone_lensing.json -o cone.npz
+
+Prints the spec's content hash and a summary of how the rays ended, and optionally
+writes the trajectories and hit records to an .npz file. Results are kept in the
+on-disk ResultCache, so rerunning an unchanged spec only loads them. --set path=value
+changes one setting of the spec, as ControlPanel.SCENE_OVERRIDES does for the Manim
+scenes, so both runners hash the same overridden spec alike.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+# Ensure imports work when run as a plain script
+_proj_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _proj_root not in sys.path:
+    sys.path.insert(0, _proj_root)
+
+from manim3d_simulator.src.scene_spec import SceneSpec, outcome_counts
+from manim3d_simulator.src.result_cache import ResultCache
+from manim3d_simulator.src.checkpoint import Checkpointer
+from manim3d_simulator.src.deflection_map import deflection_map, DEFAULT_TILE_RAYS
+from manim3d_simulator.src.backward_tracer import BackwardTracer
+
+
+def parse_setting(text):
+    """dotted.path=value, the value read as JSON when it parses (numbers, lists, null) and as text otherwise."""
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+
+def record(spec, path, dtype, checkpoint=None, resume=False):
+    """Simulate spec straight into a trajectory store file, optionally checkpointing as it goes."""
+    start = time.perf_counter()
+    engine, resumed = spec.record(path, dtype, checkpoint=checkpoint, resume=resume)
+    elapsed = time.perf_counter() - start
+    if resumed:
+        print(f"resumed from {resumed}")
+    print(f"{len(engine.positions)} rays, {engine.step_index} steps in {elapsed:.3f} s")
+    print("outcomes:", outcome_counts({
+        "hit_event": engine.hit_event,
+        "event_names": [event.name for event in engine.scene.events],
+    }))
+    print("wrote", path)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a scene spec without rendering.")
+    parser.add_argument("spec", help="scene spec (.json or .toml)")
+    parser.add_argument("-o", "--output", help="write the result arrays to this .npz file")
+    parser.add_argument("--set", type=parse_setting, action="append", default=[], metavar="PATH=VALUE",
+                        help="override a dotted spec setting, e.g. physics.integrator=rk45 (as ControlPanel.SCENE_OVERRIDES)")
+    parser.add_argument("--cache-dir", help="result cache directory (default $SIM_CACHE_DIR or ~/.cache/manim3d_simulator)")
+    parser.add_argument("--no-cache", action="store_true", help="always simulate, never read or write the cache")
+    parser.add_argument("--store", help="stream the trajectories into this memory-mappable store instead "
+                                        "of holding them in memory (bypasses the cache)")
+    parser.add_argument("--store-dtype", default="float32", choices=("float32", "float64"))
+    parser.add_argument("--checkpoint-dir", help="write periodic checkpoints here (requires --store)")
+    parser.add_argument("--checkpoint-every", type=int, default=600, help="steps between checkpoints")
+    parser.add_argument("--checkpoint-keep", type=int, default=3, help="number of checkpoints retained")
+    parser.add_argument("--resume", action="store_true", help="continue from the newest checkpoint and the store")
+    parser.add_argument("--deflection-map", nargs=2, type=int, metavar=("N_X", "N_Z"),
+                        help="trace an N_X x N_Z launch grid and write the deflection field to --map-dir")
+    parser.add_argument("--map-dir", default="deflection_map", help="output directory of --deflection-map")
+    parser.add_argument("--tile-rays", type=int, default=DEFAULT_TILE_RAYS, help="rays traced per tile")
+    parser.add_argument("--backward", nargs=2, type=int, metavar=("WIDTH", "HEIGHT"),
+                        help="trace one ray per pixel back from --observer and write the lensed image to --image")
+    parser.add_argument("--observer", nargs=3, type=float, default=(0.0, 15.0, 0.0), metavar=("X", "Y", "Z"))
+    parser.add_argument("--look-at", nargs=3, type=float, default=(0.0, 0.0, 0.0), metavar=("X", "Y", "Z"))
+    parser.add_argument("--up", nargs=3, type=float, default=(0.0, 0.0, 1.0), metavar=("X", "Y", "Z"))
+    parser.add_argument("--fov", type=float, default=40.0, help="vertical field of view in degrees")
+    parser.add_argument("--source-plane", type=float, default=-35.0, help="coordinate of the background plane")
+    parser.add_argument("--source-axis", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--image", default="lensed.npy", help="output of --backward: (H, W, 3) RGB array")
+    args = parser.parse_args(argv)
+    if (args.checkpoint_dir or args.resume) and not args.store:
+        parser.error("checkpointing needs --store, which holds the steps recorded before the checkpoint")
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume needs --checkpoint-dir")
+
+    spec = SceneSpec.load(args.spec).override(dict(args.set))
+    print(f"{spec.name}: {spec.content_hash()}")
+
+    if args.deflection_map:
+        n_x, n_z = args.deflection_map
+        start = time.perf_counter()
+        deflection_map(spec, args.map_dir, n_x, n_z, tile_rays=args.tile_rays,
+                       progress=lambda done, total: print(f"  {done}/{total} rays", flush=True))
+        print(f"{n_x}x{n_z} deflection map in {time.perf_counter() - start:.2f} s, wrote {args.map_dir}")
+        return 0
+
+    if args.backward:
+        width, height = args.backward
+        tracer = BackwardTracer(spec, args.observer, args.look_at, args.source_plane, up=args.up, fov=args.fov,
+                                width=width, height=height, source_axis=args.source_axis)
+        start = time.perf_counter()
+        trace = tracer.trace()
+        np.save(args.image, tracer.render(trace))
+        np.savez(os.path.splitext(args.image)[0] + "_trace.npz", **trace)
+        print(f"{width}x{height} pixels in {time.perf_counter() - start:.2f} s, "
+              f"{int(trace['reached'].sum())} reached the source plane; wrote {args.image}")
+        return 0
+
+    if args.store:
+        checkpoint = None
+        if args.checkpoint_dir:
+            checkpoint = Checkpointer(args.checkpoint_dir, interval=args.checkpoint_every,
+                                      keep=args.checkpoint_keep, tag=spec.content_hash())
+        return record(spec, args.store, args.store_dtype, checkpoint, args.resume)
+
+    start = time.perf_counter()
+    result = spec.result(cache=None if args.no_cache else ResultCache(args.cache_dir))
+    elapsed = time.perf_counter() - start
+    trajectories = result["trajectories"]
+    print(f"{trajectories.shape[1]} rays, {trajectories.shape[0] - 1} steps in {elapsed:.3f} s")
+    print("outcomes:", outcome_counts(result))
+
+    if args.output:
+        np.savez_compressed(args.output, **result)
+        print("wrote", args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
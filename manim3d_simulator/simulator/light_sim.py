@@ -3,6 +3,10 @@ from manim3d_simulator.control_panel import ControlPanel as cp
 from manim3d_simulator.src.light3d import Light3D as l3d
 from manim3d_simulator.src.gravity_source3d import GravitySource3D as gs3d
 from manim3d_simulator.src.antigravity_source3d import AntiGravitySource3D as as3d
+from manim3d_simulator.src.source_set import SourceSet
+from manim3d_simulator.src.engine import RayScene, TrajectoryEngine
+from manim3d_simulator.src.physics_clock import PhysicsClock
+from manim3d_simulator.src.ray_trails import RayTrails
 import numpy as np
 
 class TestLightScene(ThreeDScene):
@@ -46,34 +50,22 @@ class TestLightScene(ThreeDScene):
         self.add(light_sphere)
 
         # Path trace (nice visual of the trajectory)
-        trail = TracedPath(light_sphere.get_center, stroke_color=getattr(cp, "PATH_COLOR", BLUE), stroke_width=getattr(cp, "PATH_WIDTH", 2))
+        trail = RayTrails(light_sphere.get_center)
         self.add(trail)
 
-        # Initialize velocity for the light sphere
-        velocity = np.array([0.0, 0.0, 0.0], dtype=np.float64)
+        # Integrate the light with the headless engine; the sphere follows its state
+        sources = SourceSet.from_sources([gravity_sphere], [antigravity_sphere])
         force_scale = 0.01
+        engine = TrajectoryEngine(
+            RayScene(sources, [light_sphere.get_center()], drift_velocity=3 * UP, force_scale=force_scale),
+            dt=cp.PHYSICS_SUBSTEP,
+            method=cp.INTEGRATOR,
+        )
+        clock = PhysicsClock(engine)
 
         # Define update function for animation
         def update_sphere(mob, dt):
-            nonlocal velocity  # Keep track of velocity across frames
-
-            pos = np.array(mob.get_center(), dtype=np.float64)
-
-            # Compute forces at current position
-            gravity_force = np.array(gravity_sphere.gravitational_pull(mob.get_center()), dtype=np.float64)
-            antigravity_force = np.array(antigravity_sphere.gravitational_push(mob.get_center()), dtype=np.float64)
-
-            # Combine both forces
-            acc = (gravity_force + antigravity_force) * force_scale
-
-            # Update velocity
-            velocity += acc * dt
-            
-            # Move the sphere based on velocity
-            mob.shift(velocity * dt)
-
-            # Light moves forward
-            mob.shift(3 * UP * dt)
+            mob.move_to(clock.advance(dt)[0])
 
         # Add updater to the sphere
         light_sphere.add_updater(update_sphere)
@@ -82,4 +74,5 @@ class TestLightScene(ThreeDScene):
         self.wait(20)
 
         # Remove the updater after animation is complete
-        light_sphere.clear_updaters()
\ No newline at end of file
+        light_sphere.clear_updaters()
+        trail.clear_updaters()
\ No newline at end of file
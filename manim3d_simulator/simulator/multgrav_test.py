@@ -13,6 +13,7 @@ for p in (_pkg_root, _proj_root):
 from manim3d_simulator.control_panel import ControlPanel as cp
 from manim3d_simulator.src.gravity_source3d import GravitySource3D as gs3d
 from manim3d_simulator.src.antigravity_source3d import AntiGravitySource3D as as3d
+from manim3d_simulator.src.ray_trails import RayTrails
 
 
 class MultiGravQuick(ThreeDScene):
@@ -106,14 +107,6 @@ class MultiGravQuick(ThreeDScene):
             ).move_to([pos[1], pos[0], pos[2]])
             self.add(light)
 
-            # Subtle trace to visualize path, but lighter-weight
-            trail = TracedPath(
-                light.get_center,
-                stroke_color=getattr(cp, "PATH_COLOR", BLUE),
-                stroke_width=max(1, int(getattr(cp, "PATH_WIDTH", 2) * 0.6)),
-            )
-            self.add(trail)
-
             def make_updater():
                 velocity = np.zeros(3, dtype=np.float64)
                 force_scale = getattr(cp, "FORCE_SCALE", 0.1)
@@ -169,8 +162,16 @@ class MultiGravQuick(ThreeDScene):
             light.add_updater(make_updater())
             lights.append(light)
 
+        # Subtle trace to visualize paths, one trail group for all lights
+        trails = RayTrails(
+            lambda: [light.get_center() for light in lights],
+            stroke_width=max(1, int(getattr(cp, "PATH_WIDTH", 2) * 0.6)),
+        )
+        self.add(trails)
+
         # Short runtime for quick feedback
         self.wait(6)
 
         for light in lights:
             light.clear_updaters()
+        trails.clear_updaters()
@@ -3,6 +3,9 @@ from manim3d_simulator.control_panel import ControlPanel as cp
 from manim3d_simulator.src.light3d import Light3D as l3d
 from manim3d_simulator.src.gravity_source3d import GravitySource3D as gs3d
 from manim3d_simulator.src.antigravity_source3d import AntiGravitySource3D as as3d
+from manim3d_simulator.src.source_set import SourceSet
+from manim3d_simulator.src.engine import RayScene, TrajectoryEngine
+from manim3d_simulator.src.physics_clock import PhysicsClock
 import numpy as np
 
 class TestScene(ThreeDScene):
@@ -40,25 +43,19 @@ class TestScene(ThreeDScene):
         self.add(plane, gravity_sphere)
         self.add(light_sphere)
 
-        # Initialize velocity for the light sphere
-        velocity = np.array([0.0, 0.0, 0.0], dtype=np.float64)
+        # Integrate the light with the headless engine; the sphere follows its state
+        # (force * 0.1, then velocity += acceleration * dt * 0.1 -> force scale 0.01)
+        sources = SourceSet.from_sources([gravity_sphere])
+        engine = TrajectoryEngine(
+            RayScene(sources, [light_sphere.get_center()], drift_velocity=0.5 * RIGHT, force_scale=0.01),
+            dt=cp.PHYSICS_SUBSTEP,
+            method=cp.INTEGRATOR,
+        )
+        clock = PhysicsClock(engine)
 
         # Define update function for animation
         def update_sphere(mob, dt):
-            nonlocal velocity  # Keep track of velocity across frames
-            
-            # Calculate gravitational force
-            force = gravity_sphere.gravitational_pull(mob.get_center())
-            acceleration = np.array(force, dtype=np.float64) * 0.1
-
-            # Update velocity based on force
-            velocity += acceleration * dt * 0.1 # dt is the frame delta time
-            
-            # Move the sphere based on velocity
-            mob.shift(velocity * dt)
-
-            # Light moves forward
-            mob.shift(0.5 * RIGHT * dt)
+            mob.move_to(clock.advance(dt)[0])
 
         # Add updater to the sphere
         light_sphere.add_updater(update_sphere)
@@ -1,42 +1,31 @@
-import math
 from manim import *
 from manim3d_simulator.control_panel import ControlPanel as cp
+from manim3d_simulator.src.force_kernel import direct_accelerations
+from manim3d_simulator.src.source_visuals import source_sphere
 
 class AntiGravitySource3D(Group):
-    def __init__(self, mass, position):
+    charge = -1  # opposite charges repel
+
+    def __init__(self, mass, position, mode=None):
         super().__init__()
         self.mass = mass
         self.position = position
+        self.mode = mode  # source visual mode, cp.SOURCE_VISUAL_MODE when None
         # Create a visual object (sphere) for the anti-gravity source
         self.antigravity_sphere_obj = Group(self.antigravity_sphere())  # Wrap in Group
         self.add(self.antigravity_sphere_obj)
 
     def antigravity_sphere(self):
-        return Sphere(
-            radius=cp.GRAVITY_SOURCE_RADIUS,
-            color=cp.ANTIGRAVITY_SOURCE_COLOR,
-            fill_opacity=0.5,
-            stroke_color=cp.ANTIGRAVITY_SOURCE_COLOR
-        )
+        # Copy of a shared template sphere, low-poly unless the mode is "full"
+        return source_sphere(cp.GRAVITY_SOURCE_RADIUS, cp.ANTIGRAVITY_SOURCE_COLOR, self.mode)
 
     def gravitational_push(self, light_ray_position):
         """
         Calculate the anti-gravitational push based on distance.
         This is the inverse of gravitational_pull — it pushes objects *away* instead of pulling them *toward*.
         """
-        dx = light_ray_position[0] - self.position[0]
-        dy = light_ray_position[1] - self.position[1]
-        dz = light_ray_position[2] - self.position[2]
-        distance = math.sqrt(dx**2 + dy**2 + dz**2)
-        if distance == 0:
-            return (0, 0, 0)  # Avoid division by zero
-
-        strength = self.mass / distance**2
-        direction = (dx / distance, dy / distance, dz / distance)
-        push_vector = (strength * direction[0],
-                       strength * direction[1],
-                       strength * direction[2])
-        return push_vector
+        push_vector = direct_accelerations(light_ray_position, [self.position], [self.charge * self.mass])
+        return tuple(push_vector)
 
     def set_position(self, position):
         self.position = position
@@ -0,0 +1,150 @@
+import numpy as np
+from manim3d_simulator.src.engine import RayScene, TrajectoryEngine
+from manim3d_simulator.src.events import BoundingBox, CaptureRadius, WallPlane
+
+DEFAULT_BATCH_RAYS = 1 << 16
+
+
+def pixel_directions(position, look_at, up, fov, width, height):
+    """
+    (height, width, 3) unit directions from the observer through every pixel centre of
+    a pinhole image plane; fov is the vertical field of view in degrees. Row 0 is the
+    top of the image.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    forward = np.asarray(look_at, dtype=np.float64) - position
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, np.asarray(up, dtype=np.float64))
+    right /= np.linalg.norm(right)
+    true_up = np.cross(right, forward)
+
+    half_h = np.tan(np.radians(fov) / 2)
+    half_w = half_h * width / height
+    u = (2 * (np.arange(width) + 0.5) / width - 1) * half_w
+    v = (1 - 2 * (np.arange(height) + 0.5) / height) * half_h
+    directions = forward + u[None, :, None] * right + v[:, None, None] * true_up
+    return directions / np.linalg.norm(directions, axis=2, keepdims=True)
+
+
+def checkerboard(coords, cell=2.0):
+    """Procedural background: (..., 3) RGB in [0, 1] of a checkerboard on the source plane."""
+    parity = (np.floor(coords[..., 0] / cell) + np.floor(coords[..., 1] / cell)) % 2
+    light = np.array([0.9, 0.9, 0.9])
+    dark = np.array([0.15, 0.25, 0.6])
+    return np.where(parity[..., None] > 0, light, dark)
+
+
+def sample_image(image, extent, coords):
+    """
+    Nearest-pixel lookup of an (h, w, C) background image spanning
+    extent = (u_min, u_max, v_min, v_max) on the source plane.
+    """
+    image = np.asarray(image)
+    h, w = image.shape[:2]
+    u_min, u_max, v_min, v_max = extent
+    col = np.clip(((coords[..., 0] - u_min) / (u_max - u_min) * w).astype(np.intp), 0, w - 1)
+    row = np.clip(((v_max - coords[..., 1]) / (v_max - v_min) * h).astype(np.intp), 0, h - 1)
+    return image[row, col]
+
+
+class BackwardTracer:
+    """
+    Traces light backwards from an observer through an image-plane pixel grid onto a
+    background source plane, one ray per pixel.
+
+    The forward physics (position' = v + drift, v' = force_scale * a) is reversible:
+    running it with the drift negated and the field velocity negated retraces a ray's
+    path. A pixel ray is taken to arrive at the observer moving along -d at speed
+    (|drift| by default), where d is the pixel direction, and is followed back until
+    it crosses the source plane at axis coordinate source_plane. The spec's capture
+    radius and domain box still retire rays; its wall is a forward-only observer
+    stand-in and is not used. Pixels are traced in vectorized batches of batch_rays.
+    """
+
+    def __init__(self, spec, observer, look_at, source_plane, up=(0, 0, 1), fov=40.0,
+                 width=256, height=256, source_axis=1, speed=None, batch_rays=DEFAULT_BATCH_RAYS):
+        self.spec = spec
+        self.observer = np.asarray(observer, dtype=np.float64)
+        self.source_axis = int(source_axis)
+        self.source_plane = float(source_plane)
+        self.width, self.height = int(width), int(height)
+        self.directions = pixel_directions(observer, look_at, up, fov, self.width, self.height)
+        self.drift = np.asarray(spec.physics["drift_velocity"], dtype=np.float64)
+        self.speed = float(np.linalg.norm(self.drift) if speed is None else speed)
+        if self.speed <= 0:
+            raise ValueError("backward tracing needs a ray speed (the spec has no drift)")
+        self.batch_rays = max(1, int(batch_rays))
+        self.sources = spec.build_sources()
+        self.field = spec.build_field(self.sources, self.observer[None])
+
+    def _events(self):
+        # The source plane stops rays heading towards it from the observer's side
+        side = 1 if self.source_plane >= self.observer[self.source_axis] else -1
+        events = [WallPlane(self.source_plane, axis=self.source_axis, direction=side)]
+        termination = self.spec.termination
+        if termination["stop_distance"] is not None:
+            events.append(CaptureRadius(self.sources.positions, termination["stop_distance"]))
+        if termination["domain"]:
+            events.append(BoundingBox(termination["domain"]["min"], termination["domain"]["max"]))
+        return events
+
+    def trace(self, duration=None):
+        """
+        Returns a dict of (height, width) maps: "source_position" (.., 2) plane
+        coordinates (the two axes other than source_axis, NaN where the plane was
+        not reached), "reached" flags and "event" indices into "event_names".
+        """
+        duration = self.spec.physics["duration"] if duration is None else duration
+        flat_dirs = self.directions.reshape(-1, 3)
+        total = len(flat_dirs)
+        plane_axes = [axis for axis in range(3) if axis != self.source_axis]
+        source_position = np.full((total, 2), np.nan)
+        reached = np.zeros(total, dtype=bool)
+        event = np.full(total, -1, dtype=np.int8)
+        events = self._events()
+
+        for first in range(0, total, self.batch_rays):
+            rows = slice(first, min(first + self.batch_rays, total))
+            dirs = flat_dirs[rows]
+            # Reversed time: the field velocity u satisfies u - drift = speed * d
+            scene = RayScene(
+                self.field,
+                np.broadcast_to(self.observer, dirs.shape),
+                drift_velocity=-self.drift,
+                force_scale=self.spec.physics["force_scale"],
+                launch_velocities=self.speed * dirs + self.drift,
+                events=events,
+            )
+            engine = TrajectoryEngine(
+                scene,
+                dt=self.spec.physics["dt"],
+                method=self.spec.physics["integrator"],
+                rtol=self.spec.physics["rtol"],
+                atol=self.spec.physics["atol"],
+            )
+            engine.advance(engine.steps_for(duration))
+            hit_plane = engine.hit_event == 0
+            batch_position = np.where(hit_plane[:, None], engine.positions[:, plane_axes], np.nan)
+            source_position[rows] = batch_position
+            reached[rows] = hit_plane
+            event[rows] = engine.hit_event
+
+        shape = (self.height, self.width)
+        return {
+            "source_position": source_position.reshape(shape + (2,)),
+            "reached": reached.reshape(shape),
+            "event": event.reshape(shape),
+            "event_names": np.array([e.name for e in events]),
+        }
+
+    def render(self, trace, background=checkerboard, fill=(0.0, 0.0, 0.0)):
+        """
+        (height, width, 3) lensed image: each pixel shows the background at its
+        source-plane position. background is a function of (..., 2) coordinates,
+        e.g. checkerboard or partial(sample_image, image, extent).
+        """
+        image = np.empty((self.height, self.width, 3))
+        image[:] = fill
+        reached = trace["reached"]
+        image[reached] = background(trace["source_position"][reached])
+        return image
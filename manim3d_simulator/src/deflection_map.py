@@ -0,0 +1,97 @@
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+
+DEFAULT_TILE_RAYS = 1 << 16
+
+# 2D (n_x, n_z) output arrays, one .npy each, indexed [i_x, i_z] like the launch grid
+MAP_FIELDS = {
+    "direction": (np.float32, (3,)),        # unit outgoing direction of travel
+    "deflection_angle": (np.float32, ()),   # radians between launch and outgoing direction
+    "exit_position": (np.float32, (3,)),    # where the ray retired (or was at the end of the run)
+    "exit_time": (np.float32, ()),          # hit time, NaN for rays still in flight
+    "event": (np.int8, ()),                 # index into meta.json "events", -1 if none fired
+    "captured": (np.bool_, ()),             # retired by a capture event
+}
+
+
+def launch_plane(spec, n_x, n_z):
+    """x coordinates, z coordinates and launch height of the spec's light grid at n_x * n_z."""
+    lights = spec.lights
+    if lights.get("type") != "grid":
+        raise ValueError("a deflection map needs a spec whose lights are a launch grid")
+    xs = np.linspace(*lights["x_range"], n_x) if n_x > 1 else np.array([np.mean(lights["x_range"])])
+    zs = np.linspace(*lights["z_range"], n_z) if n_z > 1 else np.array([np.mean(lights["z_range"])])
+    return xs, zs, float(lights["y"])
+
+
+def deflection_map(spec, out_dir, n_x, n_z, tile_rays=DEFAULT_TILE_RAYS, progress=None):
+    """
+    Trace the whole n_x * n_z launch plane of spec and write the deflection field.
+
+    Launch points are integrated in tiles of at most tile_rays rays with the batched
+    engine; each tile is traced to the end of the run and only its final state is
+    kept, written straight into memory-mapped .npy files in out_dir (see MAP_FIELDS),
+    so memory is bounded by the tile size whatever the grid resolution. meta.json
+    records the grid, the event names and the spec's content hash.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    xs, zs, y = launch_plane(spec, n_x, n_z)
+    outputs = {
+        name: open_memmap(os.path.join(out_dir, name + ".npy"), mode="w+", dtype=dtype, shape=(n_x, n_z) + shape)
+        for name, (dtype, shape) in MAP_FIELDS.items()
+    }
+
+    # Sources and field are shared by every tile; a ForceGrid must span the whole plane
+    sources = spec.build_sources()
+    corners = np.array([[xs[0], y, zs[0]], [xs[-1], y, zs[-1]]])
+    field = spec.build_field(sources, corners)
+    drift = np.asarray(spec.physics["drift_velocity"], dtype=np.float64)
+    launch_direction = drift / np.linalg.norm(drift) if np.linalg.norm(drift) > 0 else None
+
+    total = n_x * n_z
+    events = None
+    for first in range(0, total, tile_rays):
+        flat = np.arange(first, min(first + tile_rays, total))
+        ix, iz = np.divmod(flat, n_z)
+        launch = np.column_stack([xs[ix], np.full(len(flat), y), zs[iz]])
+
+        engine = spec.build_engine(sources, launch_positions=launch, field=field)
+        engine.advance(engine.steps_for(spec.physics["duration"]))
+        events = [event.name for event in engine.scene.events]
+
+        velocity = engine.velocities + engine.scene.drift_velocity
+        speed = np.linalg.norm(velocity, axis=1, keepdims=True)
+        direction = np.divide(velocity, speed, out=np.zeros_like(velocity), where=speed > 0)
+        captured = np.isin(engine.hit_event, [i for i, name in enumerate(events) if name == "capture"])
+
+        outputs["direction"][ix, iz] = direction
+        outputs["exit_position"][ix, iz] = engine.positions
+        outputs["exit_time"][ix, iz] = engine.hit_time
+        outputs["event"][ix, iz] = engine.hit_event
+        outputs["captured"][ix, iz] = captured
+        if launch_direction is not None:
+            cosine = np.clip(direction @ launch_direction, -1.0, 1.0)
+            outputs["deflection_angle"][ix, iz] = np.where(speed[:, 0] > 0, np.arccos(cosine), np.nan)
+        else:
+            outputs["deflection_angle"][ix, iz] = np.nan
+        if progress is not None:
+            progress(flat[-1] + 1, total)
+
+    for array in outputs.values():
+        array.flush()
+    meta = {
+        "name": spec.name,
+        "content_hash": spec.content_hash(),
+        "n_x": n_x,
+        "n_z": n_z,
+        "x_range": [float(xs[0]), float(xs[-1])],
+        "z_range": [float(zs[0]), float(zs[-1])],
+        "launch_y": y,
+        "events": events or [],
+        "fields": list(MAP_FIELDS),
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return outputs
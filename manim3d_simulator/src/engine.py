@@ -0,0 +1,292 @@
+import math
+import numpy as np
+from manim3d_simulator.src.events import CaptureRadius, WallPlane
+from manim3d_simulator.src.integrators import DormandPrince45
+
+INTEGRATORS = ("euler", "leapfrog", "rk45")
+
+
+class RayScene:
+    """
+    Everything the headless engine needs to integrate a batch of light rays.
+
+    field:              anything with accelerations(points) and positions
+                        (SourceSet, BarnesHutTree via SourceSet, ForceGrid, ...)
+    launch_positions:   (N, 3) starting positions
+    drift_velocity:     constant velocity added on top of the field velocity (DRIFT_SPEED * DRIFT_DIR)
+    force_scale:        multiplier on the field acceleration (cp.FORCE_SCALE)
+    launch_velocities:  optional (N, 3) initial field velocities, zero by default
+    events:             termination events (events.WallPlane, CaptureRadius, BoundingBox)
+    wall_y:             shortcut for a WallPlane at y = wall_y (WALL_Y)
+    stop_distance:      shortcut for a CaptureRadius around every source (STOP_DISTANCE_THRESHOLD)
+    """
+
+    def __init__(self, field, launch_positions, drift_velocity=(0, 0, 0), force_scale=0.1,
+                 launch_velocities=None, events=(), wall_y=None, stop_distance=None):
+        self.field = field
+        self.launch_positions = np.asarray(launch_positions, dtype=np.float64).reshape(-1, 3)
+        self.drift_velocity = np.asarray(drift_velocity, dtype=np.float64).reshape(3)
+        self.force_scale = float(force_scale)
+        if launch_velocities is None:
+            self.launch_velocities = np.zeros_like(self.launch_positions)
+        else:
+            self.launch_velocities = np.asarray(launch_velocities, dtype=np.float64).reshape(-1, 3)
+        self.events = list(events)
+        if wall_y is not None:
+            self.events.append(WallPlane(wall_y, axis=1))
+        if stop_distance is not None:
+            self.events.append(CaptureRadius(field.positions, stop_distance))
+
+
+class TrajectoryEngine:
+    """
+    Integrates every ray of a RayScene together with a fixed internal dt, without Manim.
+
+    method selects the integrator:
+        "euler":    the scheme the Manim updaters use,
+                    velocity += force_scale * acc * dt; position += (velocity + drift) * dt
+        "leapfrog": symplectic kick-drift-kick, one force evaluation per step; its energy
+                    error stays bounded, so it tolerates much larger dt on long runs
+        "rk45":     Dormand-Prince with per-ray adaptive substeps inside each dt,
+                    controlled by rtol / atol (scalars or per-ray arrays)
+
+    Rays that trigger one of the scene's events are retired: frozen at the point where
+    they hit it, with hit_time / hit_position / hit_event recorded, and dropped from
+    the active id array so every later step only pays for the rays still in flight.
+    """
+
+    def __init__(self, scene, dt=1 / 60, method="euler", rtol=1e-6, atol=1e-9):
+        if method not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator {method!r}, expected one of {INTEGRATORS}")
+        self.scene = scene
+        self.dt = float(dt)
+        self.method = method
+        self.positions = scene.launch_positions.copy()
+        self.velocities = scene.launch_velocities.copy()
+        self.active = np.arange(len(self.positions))   # ids of rays still integrating
+        self.hit_time = np.full(len(self.positions), np.nan)
+        self.hit_position = np.full(self.positions.shape, np.nan)
+        self.hit_event = np.full(len(self.positions), -1)  # index into scene.events
+        self.step_index = 0
+        self.time = 0.0
+        self._ray_steps = 0
+        if method == "rk45":
+            self.rk45 = DormandPrince45(len(self.positions), rtol=rtol, atol=atol, initial_step=self.dt, max_step=self.dt)
+        # Leapfrog's closing-kick force, reused as the next step's opening kick
+        self._acc = np.zeros_like(self.positions)
+        self._acc_valid = np.zeros(len(self.positions), dtype=bool)
+
+    @property
+    def stopped(self):
+        stopped = np.ones(len(self.positions), dtype=bool)
+        stopped[self.active] = False
+        return stopped
+
+    def step(self, dt=None):
+        """Advance all active rays by one step (dt defaults to the engine's fixed dt)."""
+        dt = self.dt if dt is None else dt
+        ids = self.active
+        start = self.positions[ids]
+
+        if self.method == "rk45":
+            self._rk45_step(ids, dt)
+        elif self.method == "leapfrog":
+            self._leapfrog_step(ids, dt)
+        else:
+            scene = self.scene
+            acc = scene.field.accelerations(start) * scene.force_scale
+            self.velocities[ids] += acc * dt
+            self.positions[ids] = start + (self.velocities[ids] + scene.drift_velocity) * dt
+
+        self._retire(start, dt)
+        self._ray_steps += len(ids)
+        self.step_index += 1
+        self.time += dt
+
+    def _retire(self, start, dt):
+        if not self.scene.events:
+            return
+        ids = self.active
+        end = self.positions[ids]
+
+        # Earliest event along each segment wins
+        frac = np.full(len(ids), np.inf)
+        which = np.full(len(ids), -1)
+        for index, event in enumerate(self.scene.events):
+            event_frac = event.crossing(start, end)
+            earlier = event_frac < frac
+            frac[earlier] = event_frac[earlier]
+            which[earlier] = index
+
+        hit = np.isfinite(frac)
+        if not hit.any():
+            return
+        hit_ids = ids[hit]
+        point = start[hit] + frac[hit, None] * (end[hit] - start[hit])
+        self.positions[hit_ids] = point
+        self.hit_position[hit_ids] = point
+        self.hit_time[hit_ids] = self.time + frac[hit] * dt
+        self.hit_event[hit_ids] = which[hit]
+        self.active = ids[~hit]
+
+    def _derivative(self, state):
+        # state rows are [position, field velocity]
+        rates = np.empty_like(state)
+        rates[:, :3] = state[:, 3:] + self.scene.drift_velocity
+        rates[:, 3:] = self.scene.field.accelerations(state[:, :3]) * self.scene.force_scale
+        return rates
+
+    def _rk45_step(self, ids, dt):
+        state = np.hstack([self.positions[ids], self.velocities[ids]])
+        self.rk45.advance(self._derivative, state, ids, dt)
+        self.positions[ids] = state[:, :3]
+        self.velocities[ids] = state[:, 3:]
+
+    def _leapfrog_step(self, ids, dt):
+        scene = self.scene
+        stale = ids[~self._acc_valid[ids]]
+        if len(stale):
+            self._acc[stale] = scene.field.accelerations(self.positions[stale]) * scene.force_scale
+            self._acc_valid[stale] = True
+
+        velocities = self.velocities[ids] + 0.5 * dt * self._acc[ids]
+        positions = self.positions[ids] + (velocities + scene.drift_velocity) * dt
+        acc = scene.field.accelerations(positions) * scene.force_scale
+        self._acc[ids] = acc
+        self.velocities[ids] = velocities + 0.5 * dt * acc
+        self.positions[ids] = positions
+
+    # Everything step() reads or writes; restoring these continues a run bit for bit
+    STATE_ARRAYS = ("positions", "velocities", "active", "hit_time", "hit_position", "hit_event", "_acc", "_acc_valid")
+    RK45_ARRAYS = ("h", "accepted", "rejected", "_k1", "_k1_valid")
+
+    def state_dict(self):
+        """Copy of the full integration state as plain arrays (see checkpoint.Checkpointer)."""
+        state = {name: np.array(getattr(self, name)) for name in self.STATE_ARRAYS}
+        state["method"] = np.array(self.method)
+        state["dt"] = np.float64(self.dt)
+        state["step_index"] = np.int64(self.step_index)
+        state["time"] = np.float64(self.time)
+        state["ray_steps"] = np.int64(self._ray_steps)
+        if self.method == "rk45":
+            for name in self.RK45_ARRAYS:
+                value = getattr(self.rk45, name)
+                if value is not None:
+                    state["rk45" + name] = np.array(value)
+        return state
+
+    def load_state_dict(self, state):
+        if str(state["method"]) != self.method or len(state["positions"]) != len(self.positions):
+            raise ValueError("checkpoint was written by a different engine configuration")
+        for name in self.STATE_ARRAYS:
+            setattr(self, name, np.array(state[name]))
+        self.dt = float(state["dt"])
+        self.step_index = int(state["step_index"])
+        self.time = float(state["time"])
+        self._ray_steps = int(state["ray_steps"])
+        if self.method == "rk45":
+            for name in self.RK45_ARRAYS:
+                if "rk45" + name in state:
+                    setattr(self.rk45, name, np.array(state["rk45" + name]))
+
+    def energy(self):
+        """
+        Conserved quantity per ray: 0.5|v|^2 + drift.v + force_scale * potential.
+        Its drift over a run measures integrator error; needs a field with potentials().
+        """
+        scene = self.scene
+        kinetic = 0.5 * np.einsum("ij,ij->i", self.velocities, self.velocities)
+        return kinetic + self.velocities @ scene.drift_velocity + scene.force_scale * scene.field.potentials(self.positions)
+
+    def step_counts(self):
+        """(accepted, rejected) adaptive substeps over all rays; fixed-step methods take one per step."""
+        if self.method == "rk45":
+            return int(self.rk45.accepted.sum()), int(self.rk45.rejected.sum())
+        return self._ray_steps, 0
+
+    def run(self, steps, checkpoint=None):
+        """
+        Integrate for the given number of steps.
+        Returns a (steps + 1, N, 3) array of positions; index 0 is the current state.
+        checkpoint is an optional checkpoint.Checkpointer offered the state after every step.
+        """
+        trajectories = np.empty((steps + 1,) + self.positions.shape)
+        trajectories[0] = self.positions
+        for i in range(1, steps + 1):
+            if len(self.active) == 0:
+                # Every ray has retired; the rest of the run is frozen
+                trajectories[i:] = self.positions
+                break
+            self.step()
+            trajectories[i] = self.positions
+            if checkpoint is not None:
+                checkpoint.maybe_save(self)
+        return trajectories
+
+    def run_for(self, duration):
+        """Integrate for duration simulated seconds; see run()."""
+        return self.run(self.steps_for(duration))
+
+    def steps_for(self, duration):
+        return int(math.ceil(duration / self.dt - 1e-9))
+
+    def advance(self, steps):
+        """Integrate up to steps steps without keeping the path; stops early once every ray has retired."""
+        for _ in range(steps):
+            if len(self.active) == 0:
+                break
+            self.step()
+        return self
+
+    def record(self, writer, steps, checkpoint=None):
+        """
+        Like run(), but streams every state into a trajectory_store.TrajectoryWriter
+        instead of returning one array, so memory stays bounded on huge runs. The
+        current state is written first when the store is still empty. With a
+        checkpoint, the writer is flushed before each saved state so the store and
+        the checkpoint always agree on where to resume.
+        """
+        if writer.steps == 0:
+            writer.append(self.positions)
+        for _ in range(steps):
+            if len(self.active):
+                self.step()
+            else:
+                # Frozen steps still advance the clock so a resumed run ends in the same place
+                self.step_index += 1
+                self.time += self.dt
+            writer.append(self.positions)
+            if checkpoint is not None and checkpoint.due(self):
+                writer.flush()
+                checkpoint.save(self)
+        writer.flush()
+        return writer
+
+    def record_for(self, writer, duration, checkpoint=None):
+        """Stream until duration simulated seconds have passed since t = 0; see record()."""
+        return self.record(writer, max(self.steps_for(duration) - self.step_index, 0), checkpoint=checkpoint)
+
+
+def simulate(scene, duration, dt=1 / 60, method="euler"):
+    """Headless shortcut: trajectories of every ray in scene over duration seconds."""
+    return TrajectoryEngine(scene, dt=dt, method=method).run_for(duration)
+
+
+def compare_integrators(scene, duration, dt=1 / 60, method="leapfrog", reference="euler"):
+    """
+    Run the same scene with two integrators and report how far they disagree.
+
+    Returns a dict with the max position deviation over the whole run and, per
+    method, the max absolute energy drift from the launch energy over the rays
+    still in flight at the end.
+    """
+    report = {"trajectories": {}, "energy_drift": {}}
+    for name in (method, reference):
+        engine = TrajectoryEngine(scene, dt=dt, method=name)
+        start_energy = engine.energy()
+        report["trajectories"][name] = engine.run_for(duration)
+        drift = np.abs(engine.energy() - start_energy)[engine.active]
+        report["energy_drift"][name] = float(drift.max()) if len(drift) else 0.0
+    deviation = report["trajectories"][method] - report["trajectories"][reference]
+    report["max_deviation"] = float(np.linalg.norm(deviation, axis=2).max())
+    return report
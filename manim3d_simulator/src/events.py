@@ -0,0 +1,91 @@
+import numpy as np
+from manim3d_simulator.src.force_kernel import nearest_source
+
+# Every event answers the same question for a batch of ray segments start -> end
+# covered in one step: at what fraction f in [0, 1] along the segment does the ray
+# first trigger it (np.inf where it does not). The engine retires triggered rays at
+# start + f * (end - start) and records time + f * dt as their hit time.
+
+
+class WallPlane:
+    """Invisible wall at coordinate value along axis (WALL_Y is WallPlane(10, axis=1)).
+
+    direction=+1 stops rays reaching axis >= value, -1 stops rays reaching axis <= value.
+    """
+
+    name = "wall"
+
+    def __init__(self, value, axis=1, direction=1):
+        self.value = float(value)
+        self.axis = int(axis)
+        self.direction = 1 if direction >= 0 else -1
+
+    def crossing(self, start, end):
+        s = self.direction * (start[:, self.axis] - self.value)
+        e = self.direction * (end[:, self.axis] - self.value)
+        frac = np.full(len(start), np.inf)
+        beyond = s >= 0                 # already on or past the wall
+        crossed = ~beyond & (e >= 0)
+        frac[beyond] = 0.0
+        frac[crossed] = s[crossed] / (s[crossed] - e[crossed])
+        return frac
+
+
+class CaptureRadius:
+    """Rays ending a step within radius of any center are captured (STOP_DISTANCE_THRESHOLD).
+
+    Only segment end points are tested, so a ray fast enough to cross a whole
+    capture sphere within one step is not caught.
+    """
+
+    name = "capture"
+
+    def __init__(self, centers, radius):
+        self.centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        self.radius = float(radius)
+
+    def crossing(self, start, end):
+        frac = np.full(len(start), np.inf)
+        if len(self.centers) == 0:
+            return frac
+        distance, nearest = nearest_source(end, self.centers)
+        hit = np.flatnonzero(distance <= self.radius)
+        if len(hit) == 0:
+            return frac
+
+        # Entry point on the nearest capturing sphere: smallest root of |p0 + f d - c| = r
+        p0, seg = start[hit], end[hit] - start[hit]
+        rel = p0 - self.centers[nearest[hit]]
+        a = np.einsum("ij,ij->i", seg, seg)
+        b = 2 * np.einsum("ij,ij->i", rel, seg)
+        c = np.einsum("ij,ij->i", rel, rel) - self.radius ** 2
+        disc = np.sqrt(np.maximum(b * b - 4 * a * c, 0.0))
+        root = np.divide(-b - disc, 2 * a, out=np.ones_like(a), where=a > 0)
+        frac[hit] = np.where(c <= 0, 0.0, np.clip(root, 0.0, 1.0))
+        return frac
+
+
+class BoundingBox:
+    """Rays leaving the axis-aligned box [lo, hi] exit the domain."""
+
+    name = "exit"
+
+    def __init__(self, lo, hi):
+        self.lo = np.asarray(lo, dtype=np.float64).reshape(3)
+        self.hi = np.asarray(hi, dtype=np.float64).reshape(3)
+
+    def crossing(self, start, end):
+        frac = np.full(len(start), np.inf)
+        outside = ((end < self.lo) | (end > self.hi)).any(axis=1)
+        if not outside.any():
+            return frac
+
+        p0, p1 = start[outside], end[outside]
+        seg = p1 - p0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Per axis, the fraction at which the segment passes the face it leaves through
+            to_lo = np.where(p1 < self.lo, (self.lo - p0) / seg, np.inf)
+            to_hi = np.where(p1 > self.hi, (self.hi - p0) / seg, np.inf)
+        first = np.nan_to_num(np.minimum(to_lo, to_hi).min(axis=1), nan=0.0, posinf=1.0)
+        frac[outside] = np.clip(first, 0.0, 1.0)
+        return frac
@@ -0,0 +1,103 @@
+import numpy as np
+
+# Lattice nodes evaluated per call to the underlying field while building the grid
+BUILD_CHUNK = 8192
+
+
+class ForceGrid:
+    """
+    Precomputed field lattice over a box, sampled with trilinear interpolation.
+
+    Meant for scenes whose sources do not move: the field is summed once per lattice
+    node, after which each sample costs the same however many sources there are.
+    Cells within exact_radius of a source, where the inverse-square field is too steep
+    to interpolate, and points outside the box fall back to the exact field.
+
+    field is anything with accelerations(points) and positions, e.g. a SourceSet.
+    resolution is the number of lattice nodes along the longest side of the box.
+    """
+
+    def __init__(self, field, bounds_min, bounds_max, resolution=64, exact_radius=1.0):
+        self.field = field
+        self.lo = np.asarray(bounds_min, dtype=np.float64)
+        hi = np.asarray(bounds_max, dtype=np.float64)
+        extent = np.maximum(hi - self.lo, 1e-9)
+        self.spacing = float(extent.max()) / max(1, int(resolution) - 1)
+        self.shape = tuple(int(n) for n in np.ceil(extent / self.spacing).astype(int) + 1)
+        self.hi = self.lo + self.spacing * (np.array(self.shape) - 1)
+        self.exact_radius = float(exact_radius)
+
+        self.values = self._build_values()
+        self.exact_cells = self._build_exact_cells()
+
+    def _build_values(self):
+        # Evaluate the exact field at every lattice node, a chunk at a time
+        values = np.empty(self.shape + (3,), dtype=np.float64)
+        flat = values.reshape(-1, 3)
+        for start in range(0, len(flat), BUILD_CHUNK):
+            index = np.arange(start, min(start + BUILD_CHUNK, len(flat)))
+            nodes = self.lo + self.spacing * np.stack(np.unravel_index(index, self.shape), axis=1)
+            flat[start:start + len(index)] = self.field.accelerations(nodes)
+        return values
+
+    def _build_exact_cells(self):
+        # Flag every cell whose box comes within exact_radius of a source
+        cells = np.array(self.shape) - 1
+        exact = np.zeros(tuple(cells), dtype=bool)
+        sources = np.asarray(self.field.positions, dtype=np.float64).reshape(-1, 3)
+        if self.exact_radius <= 0 or len(sources) == 0:
+            return exact
+
+        reach = int(np.ceil(self.exact_radius / self.spacing)) + 1
+        span = np.arange(-reach, reach + 1)
+        offsets = np.stack(np.meshgrid(span, span, span, indexing="ij"), axis=-1).reshape(-1, 3)
+        chunk = max(1, BUILD_CHUNK // len(offsets))
+        for start in range(0, len(sources), chunk):
+            src = sources[start:start + chunk]
+            home = np.floor((src - self.lo) / self.spacing).astype(int)
+            cell = home[:, None, :] + offsets[None, :, :]                   # (S, K, 3)
+            inside = ((cell >= 0) & (cell < cells)).all(axis=2)
+            # Distance from the source to the closest point of each candidate cell
+            cell_lo = self.lo + self.spacing * cell
+            closest = np.clip(src[:, None, :], cell_lo, cell_lo + self.spacing)
+            near = np.linalg.norm(closest - src[:, None, :], axis=2) <= self.exact_radius
+            hit = cell[inside & near]
+            exact[hit[:, 0], hit[:, 1], hit[:, 2]] = True
+        return exact
+
+    @property
+    def positions(self):
+        return self.field.positions
+
+    def potentials(self, points):
+        return self.field.potentials(points)
+
+    def accelerations(self, points):
+        """Interpolated field at each point; same contract as force_kernel.direct_accelerations."""
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+        points = points.reshape(-1, 3)
+        acc = np.empty_like(points)
+
+        frac = (points - self.lo) / self.spacing
+        inside = ((points >= self.lo) & (points <= self.hi)).all(axis=1)
+        base = np.clip(np.floor(frac).astype(int), 0, np.array(self.shape) - 2)
+        exact = ~inside
+        exact[inside] = self.exact_cells[tuple(base[inside].T)]
+
+        grid = ~exact
+        if grid.any():
+            i, j, k = base[grid].T
+            tx, ty, tz = (frac[grid] - base[grid]).T[:, :, None]
+            v = self.values
+            c00 = v[i, j, k] * (1 - tx) + v[i + 1, j, k] * tx
+            c10 = v[i, j + 1, k] * (1 - tx) + v[i + 1, j + 1, k] * tx
+            c01 = v[i, j, k + 1] * (1 - tx) + v[i + 1, j, k + 1] * tx
+            c11 = v[i, j + 1, k + 1] * (1 - tx) + v[i + 1, j + 1, k + 1] * tx
+            c0 = c00 * (1 - ty) + c10 * ty
+            c1 = c01 * (1 - ty) + c11 * ty
+            acc[grid] = c0 * (1 - tz) + c1 * tz
+        if exact.any():
+            acc[exact] = self.field.accelerations(points[exact])
+
+        return acc[0] if single else acc
@@ -0,0 +1,102 @@
+import numpy as np
+
+# Upper bound on (light, source) pairs evaluated at once; keeps the temporary
+# (N, chunk, 3) delta array at a few hundred MB even for very large scenes.
+MAX_PAIRS_PER_CHUNK = 1 << 22
+
+
+def direct_accelerations(positions, source_positions, signed_masses):
+    """
+    Sum the inverse-square field of every source at every position in one call.
+
+    positions:        (N, 3) array of light positions (a single (3,) point also works)
+    source_positions: (M, 3) array of source positions
+    signed_masses:    (M,) array, +mass for gravity (pull), -mass for antigravity (push)
+
+    Returns the (N, 3) accelerations, or a (3,) vector for a single point.
+    A light sitting exactly on a source gets no contribution from it, matching
+    the divide-by-zero guard in GravitySource3D / AntiGravitySource3D.
+    """
+    points = np.asarray(positions, dtype=np.float64)
+    single = points.ndim == 1
+    points = points.reshape(-1, 3)
+    sources = np.asarray(source_positions, dtype=np.float64).reshape(-1, 3)
+    masses = np.asarray(signed_masses, dtype=np.float64).reshape(-1)
+
+    acc = np.zeros_like(points)
+    if len(points) == 0 or len(sources) == 0:
+        return acc[0] if single else acc
+
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // len(points))
+    for start in range(0, len(sources), chunk):
+        stop = start + chunk
+        delta = sources[None, start:stop, :] - points[:, None, :]  # (N, C, 3) light -> source
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        # mass / d^2 along the unit vector == mass * delta / d^3
+        inv_d3 = np.zeros_like(dist_sq)
+        np.power(dist_sq, -1.5, out=inv_d3, where=dist_sq > 0)
+        acc += np.einsum("ij,ijk->ik", inv_d3 * masses[None, start:stop], delta)
+
+    return acc[0] if single else acc
+
+
+def stack_sources(*source_groups):
+    """
+    Flatten lists of GravitySource3D / AntiGravitySource3D objects into the
+    (M, 3) positions and (M,) signed masses expected by direct_accelerations.
+    """
+    sources = [src for group in source_groups for src in group]
+    positions = np.array([src.position for src in sources], dtype=np.float64).reshape(-1, 3)
+    signed_masses = np.array([src.charge * src.mass for src in sources], dtype=np.float64)
+    return positions, signed_masses
+
+
+def nearest_source(positions, source_positions):
+    """
+    Closest source to each of the (N, 3) positions.
+    Returns (distances, indices) as (N,) arrays; indices are -1 when there are no sources.
+    """
+    points = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    sources = np.asarray(source_positions, dtype=np.float64).reshape(-1, 3)
+    nearest_sq = np.full(len(points), np.inf)
+    nearest = np.full(len(points), -1, dtype=np.intp)
+    if len(points) == 0:
+        return nearest_sq, nearest
+
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // len(points))
+    for start in range(0, len(sources), chunk):
+        delta = sources[None, start:start + chunk, :] - points[:, None, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        best = dist_sq.argmin(axis=1)
+        best_sq = dist_sq[np.arange(len(points)), best]
+        closer = best_sq < nearest_sq
+        nearest_sq[closer] = best_sq[closer]
+        nearest[closer] = start + best[closer]
+    return np.sqrt(nearest_sq), nearest
+
+
+def nearest_source_distance(positions, source_positions):
+    """Distance from each of the (N, 3) positions to its closest source, as an (N,) array."""
+    return nearest_source(positions, source_positions)[0]
+
+
+def direct_potentials(positions, source_positions, signed_masses):
+    """
+    Potential -sum(mass / d) at each position, so that direct_accelerations is its
+    negative gradient. Used for energy diagnostics; same chunking and guards.
+    """
+    points = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    sources = np.asarray(source_positions, dtype=np.float64).reshape(-1, 3)
+    masses = np.asarray(signed_masses, dtype=np.float64).reshape(-1)
+    phi = np.zeros(len(points))
+    if len(points) == 0:
+        return phi
+
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // len(points))
+    for start in range(0, len(sources), chunk):
+        delta = sources[None, start:start + chunk, :] - points[:, None, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        inv_d = np.zeros_like(dist_sq)
+        np.power(dist_sq, -0.5, out=inv_d, where=dist_sq > 0)
+        phi -= inv_d @ masses[start:start + chunk]
+    return phi
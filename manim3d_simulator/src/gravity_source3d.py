@@ -1,39 +1,28 @@
-import math
 from manim import *
 from manim3d_simulator.control_panel import ControlPanel as cp
+from manim3d_simulator.src.force_kernel import direct_accelerations
+from manim3d_simulator.src.source_visuals import source_sphere
 
 class GravitySource3D(Group):
-    def __init__(self, mass, position):
+    charge = 1  # like charges attract
+
+    def __init__(self, mass, position, mode=None):
         super().__init__()
         self.mass = mass
         self.position = position
+        self.mode = mode  # source visual mode, cp.SOURCE_VISUAL_MODE when None
         # Create a visual object, like a dot, at the gravity source's position
         self.gravity_sphere_obj = Group(self.gravity_sphere())  # Wrap the gravity sphere in a Group
         self.add(self.gravity_sphere_obj)  # Add the sphere Group to this Group
 
     def gravity_sphere(self):
-        return Sphere(
-            radius=cp.GRAVITY_SOURCE_RADIUS, 
-            color=cp.GRAVITY_SOURCE_COLOR,
-            fill_opacity=0.5,
-            stroke_color=cp.GRAVITY_SOURCE_COLOR
-        )
+        # Copy of a shared template sphere, low-poly unless the mode is "full"
+        return source_sphere(cp.GRAVITY_SOURCE_RADIUS, cp.GRAVITY_SOURCE_COLOR, self.mode)
 
     def gravitational_pull(self, light_ray_position):
         # Calculate the gravitational pull based on distance
-        distance = math.sqrt((light_ray_position[0] - self.position[0])**2 + 
-                             (light_ray_position[1] - self.position[1])**2 + 
-                             (light_ray_position[2] - self.position[2])**2)
-        if distance == 0:
-            return (0, 0, 0)    # Avoid division by zero
-        strength = self.mass / distance**2
-        direction = (
-            (self.position[0] - light_ray_position[0]) / distance,
-            (self.position[1] - light_ray_position[1]) / distance,
-            (self.position[2] - light_ray_position[2]) / distance
-        )
-        pull_vector = (strength * direction[0], strength * direction[1], strength * direction[2])
-        return pull_vector
+        pull_vector = direct_accelerations(light_ray_position, [self.position], [self.charge * self.mass])
+        return tuple(pull_vector)
     
     def set_position(self, position):
         self.position = position
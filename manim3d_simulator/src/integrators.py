@@ -0,0 +1,106 @@
+import numpy as np
+
+# Dormand-Prince 5(4) tableau; the 7th stage is evaluated at the accepted
+# 5th-order solution, so it doubles as the next step's first stage (FSAL).
+DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+DP_B5 = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_B4 = np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+DP_E = DP_B5 - DP_B4
+
+
+class DormandPrince45:
+    """
+    Vectorized embedded RK45 with an independent step size and tolerance per ray.
+
+    Each ray carries its own step h between calls: rays far from every source grow
+    h up to max_step, rays in a close encounter shrink it until the local error
+    estimate is within atol + rtol * |y|. rtol and atol may be scalars or (N,) arrays.
+    accepted / rejected count attempted steps per ray. A ray whose step stays
+    non-finite down to min_step is left where it is for the rest of the interval.
+    """
+
+    def __init__(self, n_rays, rtol=1e-6, atol=1e-9, initial_step=1e-2, min_step=1e-9, max_step=np.inf):
+        self.rtol = np.broadcast_to(np.asarray(rtol, dtype=np.float64), (n_rays,)).copy()
+        self.atol = np.broadcast_to(np.asarray(atol, dtype=np.float64), (n_rays,)).copy()
+        self.h = np.full(n_rays, float(initial_step))
+        self.min_step = float(min_step)
+        self.max_step = float(max_step)
+        self.accepted = np.zeros(n_rays, dtype=np.int64)
+        self.rejected = np.zeros(n_rays, dtype=np.int64)
+        self._k1 = None
+        self._k1_valid = np.zeros(n_rays, dtype=bool)
+
+    def invalidate(self, rays):
+        """Forget the cached first stage for rays whose state was changed from outside."""
+        self._k1_valid[rays] = False
+
+    def advance(self, derivative, y, rays, interval):
+        """
+        Advance the states y in place by interval, taking as many adaptive steps per
+        ray as its error control needs. Row i of y belongs to ray id rays[i], which
+        selects that ray's step size and tolerances. derivative maps (P, D) states to
+        (P, D) rates.
+        """
+        rays = np.asarray(rays, dtype=np.intp)
+        if self._k1 is None:
+            self._k1 = np.zeros((len(self.h), y.shape[1]))
+        elapsed = np.zeros(len(rays))
+        end = interval * (1 - 1e-12)
+
+        while True:
+            todo = np.flatnonzero(elapsed < end)
+            if len(todo) == 0:
+                return
+            idx = rays[todo]
+            y0 = y[todo]
+            remaining = interval - elapsed[todo]
+            h = np.minimum(self.h[idx], remaining)
+            truncated = h < self.h[idx]
+
+            # Stages; reuse the FSAL stage from the previous accepted step where valid
+            k = np.empty((7,) + y0.shape)
+            cached = self._k1_valid[idx]
+            k[0][cached] = self._k1[idx[cached]]
+            if (~cached).any():
+                k[0][~cached] = derivative(y0[~cached])
+            for stage in range(1, 7):
+                coeffs = DP_A[stage]
+                incr = sum(c * k[j] for j, c in enumerate(coeffs) if c)
+                k[stage] = derivative(y0 + h[:, None] * incr)
+
+            y5 = y0 + h[:, None] * np.tensordot(DP_B5, k, axes=1)
+            err = h[:, None] * np.tensordot(DP_E, k, axes=1)
+            scale = self.atol[idx, None] + self.rtol[idx, None] * np.maximum(np.abs(y0), np.abs(y5))
+            err_norm = np.sqrt(np.mean((err / scale) ** 2, axis=1))
+
+            # A non-finite error (e.g. a ray landing on a source) is always rejected and
+            # cuts h hard; once h is at min_step such a ray is frozen for the interval
+            finite = np.isfinite(err_norm) & np.isfinite(y5).all(axis=1)
+            accept = finite & ((err_norm <= 1) | (h <= self.min_step))
+            frozen = ~finite & (h <= self.min_step)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                factor = np.clip(0.9 * err_norm ** -0.2, 0.2, 5.0)
+            factor = np.where(finite, factor, 0.2)
+            factor = np.where(accept, factor, np.minimum(factor, 1.0))
+            new_h = h * factor
+            # A step cut short to land on the interval end says nothing about the natural step
+            new_h = np.where(accept & truncated, np.maximum(self.h[idx], new_h), new_h)
+            self.h[idx] = np.clip(new_h, self.min_step, self.max_step)
+
+            done = idx[accept]
+            y[todo[accept]] = y5[accept]
+            self._k1[done] = k[6][accept]
+            self._k1_valid[done] = True
+            elapsed[todo[accept]] += h[accept]
+            self.accepted[done] += 1
+            self.rejected[idx[~accept]] += 1
+            elapsed[todo[frozen]] = interval
+            self._k1_valid[idx[frozen]] = False
@@ -0,0 +1,26 @@
+from manim import *
+import numpy as np
+from manim3d_simulator.control_panel import ControlPanel as cp
+
+
+class LightCloud(PMobject):
+    """
+    All lights of a scene as one point-cloud mobject backed by a single (N, 3) array.
+
+    Row i of the points array is light i, so a whole frame of positions is written
+    with one array assignment instead of a move_to per Sphere mesh; render cost
+    grows with the point count only, not with one mesh per light.
+    """
+
+    def __init__(self, positions, color=None, stroke_width=None, **kwargs):
+        super().__init__(stroke_width=cp.LIGHT_CLOUD_POINT_SIZE if stroke_width is None else stroke_width, **kwargs)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.add_points(positions, color=cp.LIGHT_COLOR if color is None else color)
+
+    def get_positions(self):
+        return self.points
+
+    def set_positions(self, positions):
+        """Overwrite every light position at once from an (N, 3) array."""
+        self.points[:] = positions
+        return self
@@ -0,0 +1,189 @@
+import numpy as np
+from manim3d_simulator.src.force_kernel import direct_accelerations
+
+# Upper bound on (light, node) pairs processed at once while walking the tree;
+# keeps memory flat even for small opening angles.
+MAX_PAIRS_PER_CHUNK = 1 << 16
+
+
+class BarnesHutTree:
+    """
+    Octree over signed-charge sources for O(N log M) field evaluation.
+
+    Every node keeps two monopoles: the summed positive (gravity) mass with its
+    centre of mass, and the summed negative (antigravity) mass with its own centre.
+    Far nodes are applied as those two monopoles, so a node whose charges cancel
+    contributes the dipole-like difference rather than a single smeared mass.
+
+    theta is the opening angle: a node of width s at distance d is opened when
+    s / d >= theta. theta = 0 reduces to direct summation.
+    """
+
+    def __init__(self, source_positions, signed_masses, theta=0.5, leaf_size=16, max_depth=24):
+        self.theta = float(theta)
+        self.leaf_size = max(1, int(leaf_size))
+        self.max_depth = int(max_depth)
+
+        positions = np.asarray(source_positions, dtype=np.float64).reshape(-1, 3)
+        masses = np.asarray(signed_masses, dtype=np.float64).reshape(-1)
+        self._build(positions, masses)
+
+    def _build(self, positions, masses):
+        count = len(positions)
+        order = np.arange(count)
+
+        if count:
+            lo, hi = positions.min(axis=0), positions.max(axis=0)
+        else:
+            lo, hi = np.zeros(3), np.zeros(3)
+        root_center = 0.5 * (lo + hi)
+        root_half = max(0.5 * float(np.max(hi - lo)), 1e-9) * (1 + 1e-9)
+
+        centers, halves, children, starts, counts = [], [], [], [], []
+        stack = [(root_center, root_half, 0, count, 0, -1, 0)]
+        while stack:
+            center, half, start, stop, depth, parent, octant = stack.pop()
+            node = len(centers)
+            if parent >= 0:
+                children[parent][octant] = node
+            centers.append(center)
+            halves.append(half)
+            children.append([-1] * 8)
+            starts.append(start)
+            counts.append(stop - start)
+
+            if stop - start <= self.leaf_size or depth >= self.max_depth:
+                continue
+
+            # Reorder this node's slice by octant so each child owns a contiguous range
+            idx = order[start:stop]
+            above = positions[idx] >= center
+            codes = above[:, 0] * 1 + above[:, 1] * 2 + above[:, 2] * 4
+            sort = np.argsort(codes, kind="stable")
+            order[start:stop] = idx[sort]
+            bounds = start + np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=8))])
+
+            for code in range(8):
+                if bounds[code + 1] > bounds[code]:
+                    offset = np.array([code & 1, (code >> 1) & 1, (code >> 2) & 1]) - 0.5
+                    stack.append((center + offset * half, 0.5 * half,
+                                  bounds[code], bounds[code + 1], depth + 1, node, code))
+
+        self.positions = positions[order]
+        self.masses = masses[order]
+        self.centers = np.array(centers).reshape(-1, 3)
+        self.widths = 2 * np.array(halves)
+        self.children = np.array(children, dtype=np.intp).reshape(-1, 8)
+        self.is_leaf = (self.children < 0).all(axis=1)
+        starts = np.array(starts, dtype=np.intp)
+        counts = np.array(counts, dtype=np.intp)
+
+        # Per-node positive and negative charge totals with their own centres
+        positive = np.clip(self.masses, 0, None)
+        negative = np.clip(-self.masses, 0, None)
+        self.pos_mass, self.pos_com = self._node_moments(starts, counts, positive)
+        self.neg_mass, self.neg_com = self._node_moments(starts, counts, negative)
+
+        # Leaf members padded to a fixed width for vectorized direct summation
+        width = int(counts[self.is_leaf].max()) if count else 1
+        self.leaf_members = np.full((len(centers), width), -1, dtype=np.intp)
+        for node in np.flatnonzero(self.is_leaf):
+            self.leaf_members[node, :counts[node]] = np.arange(starts[node], starts[node] + counts[node])
+
+    def _node_moments(self, starts, counts, weights):
+        # Prefix sums over the tree-ordered sources give every node's total in O(1)
+        mass_prefix = np.concatenate([[0.0], np.cumsum(weights)])
+        moment_prefix = np.vstack([np.zeros(3), np.cumsum(weights[:, None] * self.positions, axis=0)])
+        stops = starts + counts
+        mass = mass_prefix[stops] - mass_prefix[starts]
+        moment = moment_prefix[stops] - moment_prefix[starts]
+        com = np.where(mass[:, None] > 0, moment / np.where(mass > 0, mass, 1.0)[:, None], self.centers)
+        return mass, com
+
+    def accelerations(self, points):
+        """Approximate net field at each point; same contract as force_kernel.direct_accelerations."""
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+        points = points.reshape(-1, 3)
+        acc = np.zeros_like(points)
+        if len(self.positions):
+            self._walk(points, acc)
+        return acc[0] if single else acc
+
+    def _walk(self, points, acc):
+        # Depth-first over chunks of (light, node) pairs, starting with every light at the root
+        pending = [(np.arange(len(points)), np.zeros(len(points), dtype=np.intp))]
+        while pending:
+            pair_point, pair_node = pending.pop()
+            if len(pair_point) > MAX_PAIRS_PER_CHUNK:
+                pending.append((pair_point[MAX_PAIRS_PER_CHUNK:], pair_node[MAX_PAIRS_PER_CHUNK:]))
+                pair_point, pair_node = pair_point[:MAX_PAIRS_PER_CHUNK], pair_node[:MAX_PAIRS_PER_CHUNK]
+
+            x = points[pair_point]
+            to_pos = self.pos_com[pair_node] - x
+            to_neg = self.neg_com[pair_node] - x
+            d_pos = np.sqrt(np.einsum("ij,ij->i", to_pos, to_pos))
+            d_neg = np.sqrt(np.einsum("ij,ij->i", to_neg, to_neg))
+            # Judge the opening angle against the nearer of the charge centres that exist
+            d_pos_open = np.where(self.pos_mass[pair_node] > 0, d_pos, np.inf)
+            d_neg_open = np.where(self.neg_mass[pair_node] > 0, d_neg, np.inf)
+            far = self.widths[pair_node] < self.theta * np.minimum(d_pos_open, d_neg_open)
+            # Never approximate a node the light is inside of, whatever theta is
+            far &= np.abs(x - self.centers[pair_node]).max(axis=1) > 0.5 * self.widths[pair_node]
+
+            # Far nodes: one positive and one negative monopole each
+            if far.any():
+                contrib = (_monopole(to_pos[far], d_pos[far], self.pos_mass[pair_node[far]])
+                           - _monopole(to_neg[far], d_neg[far], self.neg_mass[pair_node[far]]))
+                _scatter_add(acc, pair_point[far], contrib)
+
+            near = ~far
+            leaf = near & self.is_leaf[pair_node]
+            if leaf.any():
+                _scatter_add(acc, pair_point[leaf], self._leaf_sum(points[pair_point[leaf]], pair_node[leaf]))
+
+            # Opened internal nodes hand the light on to each existing child
+            inner = near & ~self.is_leaf[pair_node]
+            kids = self.children[pair_node[inner]]
+            has_kid = kids >= 0
+            if has_kid.any():
+                pending.append((np.repeat(pair_point[inner], has_kid.sum(axis=1)), kids[has_kid]))
+
+    def _leaf_sum(self, points, nodes):
+        members = self.leaf_members[nodes]                  # (P, width), -1 padded
+        valid = members >= 0
+        idx = np.where(valid, members, 0)
+        delta = self.positions[idx] - points[:, None, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        inv_d3 = np.zeros_like(dist_sq)
+        np.power(dist_sq, -1.5, out=inv_d3, where=valid & (dist_sq > 0))
+        return np.einsum("ij,ijk->ik", inv_d3 * self.masses[idx], delta)
+
+    def estimate_error(self, points, sample_size=256, seed=0):
+        """
+        Compare against direct summation on a random subset of points.
+
+        Returns (max_error, rms_error), both relative to the mean direct field
+        magnitude over the sample. Per-point relative error is not used because
+        the TCG field can cancel to ~0 between opposite charges.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        rng = np.random.default_rng(seed)
+        if len(points) > sample_size:
+            points = points[rng.choice(len(points), sample_size, replace=False)]
+        exact = direct_accelerations(points, self.positions, self.masses)
+        approx = self.accelerations(points)
+        scale = max(float(np.linalg.norm(exact, axis=1).mean()), 1e-300)
+        error = np.linalg.norm(approx - exact, axis=1) / scale
+        return float(error.max()), float(np.sqrt(np.mean(error ** 2)))
+
+
+def _monopole(delta, dist, mass):
+    inv_d3 = np.zeros_like(dist)
+    np.power(dist, -3.0, out=inv_d3, where=dist > 0)
+    return (mass * inv_d3)[:, None] * delta
+
+
+def _scatter_add(acc, rows, values):
+    for axis in range(3):
+        acc[:, axis] += np.bincount(rows, weights=values[:, axis], minlength=len(acc))
@@ -0,0 +1,171 @@
+import itertools
+import json
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from manim3d_simulator.src.scene_spec import SceneSpec, outcome_counts
+from manim3d_simulator.src.result_cache import ResultCache, DEFAULT_MAX_BYTES
+
+# Thread-count variables read by the BLAS / OpenMP runtimes when numpy is first imported
+BLAS_THREAD_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def grid_points(axes):
+    """Every combination of {dotted path: [values]}; yields {path: value} dicts."""
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def declared_types(spec, names):
+    """
+    int or float for each dotted path, from the type of the base spec's normalized
+    value there (so generator counts such as layers stay integers); float where the
+    spec has no numeric value at that path.
+    """
+    data = spec.normalized()
+    types = {}
+    for name in names:
+        value = data
+        try:
+            for key in name.split("."):
+                value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            value = None
+        types[name] = int if isinstance(value, int) and not isinstance(value, bool) else float
+    return types
+
+
+def random_points(ranges, count, seed=0, types=None):
+    """
+    count uniform samples of {dotted path: (low, high)}; yields {path: value} dicts.
+    Paths typed int in types (see declared_types) are drawn as integers in [low, high].
+    """
+    rng = np.random.default_rng(seed)
+    names = list(ranges)
+    types = types or {}
+    for _ in range(count):
+        point = {}
+        for name in names:
+            low, high = ranges[name]
+            if types.get(name, float) is int:
+                point[name] = int(rng.integers(int(low), int(high), endpoint=True))
+            else:
+                point[name] = float(rng.uniform(low, high))
+        yield point
+
+
+def point_summary(result):
+    """Small per-point record kept in the sweep index; the full arrays stay in the cache."""
+    hit = np.isfinite(result["hit_time"])
+    return {
+        "outcomes": outcome_counts(result),
+        "mean_hit_time": float(result["hit_time"][hit].mean()) if hit.any() else None,
+        "mean_hit_position": result["hit_position"][hit].mean(axis=0).tolist() if hit.any() else None,
+    }
+
+
+def _pin_threads(threads):
+    # The environment covers runtimes loaded after this point; threadpoolctl, when
+    # installed, also limits the ones numpy has already started
+    for name in BLAS_THREAD_VARS:
+        os.environ[name] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+def _run_point(spec_data, cache_dir, max_bytes):
+    spec = SceneSpec(spec_data)
+    start = time.perf_counter()
+    result = spec.result(cache=ResultCache(cache_dir, max_bytes=max_bytes))
+    return point_summary(result), time.perf_counter() - start
+
+
+class ParameterSweep:
+    """
+    Expands a base SceneSpec over parameter points and runs them across a process pool.
+
+    Each point is a {dotted path: value} override of the base spec (see
+    SceneSpec.override). Every run goes through the shared ResultCache, so points
+    whose content hash is already cached are answered without simulating, and a
+    killed sweep picks up where it stopped. Workers are started with spawn and
+    BLAS pinned to threads_per_worker threads, so N workers do not each start a
+    full-size BLAS pool. Finished points are appended to one JSON-lines index as
+    they complete: point number, overrides, content hash, summary, timing.
+    """
+
+    def __init__(self, base_spec, points, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES,
+                 workers=None, threads_per_worker=1):
+        self.base_spec = base_spec
+        self.points = list(points)
+        self.cache = ResultCache(cache_dir, max_bytes=max_bytes)
+        self.workers = workers or os.cpu_count() or 1
+        self.threads_per_worker = max(1, int(threads_per_worker))
+
+    def specs(self):
+        return [self.base_spec.override(point) for point in self.points]
+
+    def run(self, index_path, progress=None):
+        """Run every point, streaming records into index_path; returns the records by point number."""
+        specs = self.specs()
+        records = [None] * len(specs)
+        with open(index_path, "w", encoding="utf-8") as index:
+            def emit(number, summary, elapsed, cached):
+                records[number] = {
+                    "point": number,
+                    "params": self.points[number],
+                    "content_hash": specs[number].content_hash(),
+                    "cached": cached,
+                    "seconds": round(elapsed, 4),
+                    **summary,
+                }
+                index.write(json.dumps(records[number]) + "\n")
+                index.flush()
+                if progress is not None:
+                    progress(records[number])
+
+            pending = []
+            for number, spec in enumerate(specs):
+                start = time.perf_counter()
+                cached = self.cache.get(self.cache.key(spec.content_hash()))
+                if cached is not None:
+                    emit(number, point_summary(cached), time.perf_counter() - start, True)
+                else:
+                    pending.append(number)
+            if not pending:
+                return records
+
+            saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARS}
+            _pin_threads(self.threads_per_worker)   # spawned workers inherit the environment
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(pending)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_pin_threads,
+                    initargs=(self.threads_per_worker,),
+                ) as pool:
+                    futures = {
+                        pool.submit(_run_point, specs[number].to_dict(), self.cache.directory, self.cache.max_bytes): number
+                        for number in pending
+                    }
+                    for future in as_completed(futures):
+                        summary, elapsed = future.result()
+                        emit(futures[future], summary, elapsed, False)
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+        return records
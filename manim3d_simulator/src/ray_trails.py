@@ -0,0 +1,43 @@
+from manim import *
+import numpy as np
+from manim3d_simulator.control_panel import ControlPanel as cp
+from manim3d_simulator.src.trail_buffer import TrailBuffer
+
+
+class RayTrails(VGroup):
+    """
+    Trails of all rays at once, one polyline per ray fed from a shared TrailBuffer.
+
+    positions_func returns the current (N, 3) ray positions (e.g. a LightCloud's
+    get_positions); one updater samples it into the ring buffer each frame and
+    rebuilds only the polylines of rays that received a sample. Trails are capped
+    at capacity samples, so memory and per-frame cost stay bounded on long waits,
+    unlike one unbounded TracedPath per light.
+    """
+
+    def __init__(self, positions_func, capacity=None, decimation=None,
+                 stroke_color=None, stroke_width=None, **kwargs):
+        super().__init__(**kwargs)
+        self.positions_func = positions_func
+        start = np.asarray(positions_func(), dtype=np.float64).reshape(-1, 3)
+        self.buffer = TrailBuffer(
+            len(start),
+            capacity=cp.TRAIL_CAPACITY if capacity is None else capacity,
+            decimation=cp.TRAIL_DECIMATION if decimation is None else decimation,
+        )
+        self.add(*[
+            VMobject(
+                stroke_color=cp.PATH_COLOR if stroke_color is None else stroke_color,
+                stroke_width=cp.PATH_WIDTH if stroke_width is None else stroke_width,
+            )
+            for _ in range(len(start))
+        ])
+        self.buffer.append(start)
+        self.add_updater(self._update_trails)
+
+    def _update_trails(self, mob, dt):
+        self.buffer.append(self.positions_func())
+        for i in self.buffer.clean():
+            points = self.buffer.ray(i)
+            if len(points) > 1:
+                self.submobjects[i].set_points_as_corners(points)
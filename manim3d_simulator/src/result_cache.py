@@ -0,0 +1,180 @@
+import hashlib
+import os
+import tempfile
+import time
+import numpy as np
+
+# Bump when integrator or event code changes make old results stale
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SIM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "manim3d_simulator")
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+HASH_CHUNK = 1 << 20
+# Age (seconds) after which a temporary file, or an archive or sidecar without its
+# partner, is taken for the leftover of a crashed put() rather than one in progress
+STALE_AFTER = 3600
+
+
+def _digest(f):
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(HASH_CHUNK), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return _digest(f)
+
+
+def _write_temp(directory, write):
+    """Write a complete temporary file in directory; returns its path for os.replace."""
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return tmp
+
+
+class ResultCache:
+    """
+    Directory of simulation results keyed by scene content hash.
+
+    Each entry is <key>.npz (uncompressed, so loading is a plain read) plus a
+    <key>.sha256 sidecar with the checksum of the archive. Both are written to
+    temporary files and renamed into place, the archive first and the sidecar last,
+    so an entry only becomes visible once it is complete; a missing sidecar is a
+    plain miss. Entries are verified on every read; an archive that does not match
+    its sidecar (corrupt, or replaced by a concurrent put()) is a miss and left for
+    the next put() to overwrite. Entries are evicted least recently used first once
+    the directory grows beyond max_bytes, and eviction also removes what a crashed
+    put() left behind. Reads refresh an entry's mtime, which is the LRU clock.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(DEFAULT_CACHE_DIR if directory is None else directory)
+        self.max_bytes = int(max_bytes)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, content_hash, **extra):
+        """Cache key for a scene hash plus any extra parameters that change the result."""
+        parts = [f"v{CACHE_VERSION}", content_hash] + [f"{k}={extra[k]!r}" for k in sorted(extra)]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".npz", base + ".sha256"
+
+    def __contains__(self, key):
+        data_path, sum_path = self._paths(key)
+        return os.path.exists(data_path) and os.path.exists(sum_path)
+
+    def get(self, key):
+        """Dict of arrays stored under key, or None on a miss or failed integrity check."""
+        data_path, sum_path = self._paths(key)
+        try:
+            with open(sum_path, "r", encoding="ascii") as f:
+                expected = f.read().strip()
+            # Hash and load the same open file, so a concurrent os.replace cannot slip between them
+            with open(data_path, "rb") as f:
+                if _digest(f) != expected:
+                    return None
+                f.seek(0)
+                with np.load(f, allow_pickle=False) as archive:
+                    arrays = {name: archive[name] for name in archive.files}
+            os.utime(data_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # The archive matched its checksum but cannot be read: the entry itself is bad
+            self.discard(key)
+            return None
+        return arrays
+
+    def put(self, key, arrays):
+        data_path, sum_path = self._paths(key)
+        data_tmp = _write_temp(self.directory, lambda f: np.savez(f, **arrays))
+        try:
+            digest = file_digest(data_tmp)
+            sum_tmp = _write_temp(self.directory, lambda f: f.write(digest.encode("ascii")))
+        except BaseException:
+            os.remove(data_tmp)
+            raise
+        # Archive first, sidecar last: readers treat a missing sidecar as a miss
+        os.replace(data_tmp, data_path)
+        os.replace(sum_tmp, sum_path)
+        self.evict(keep=key)
+
+    def get_or_compute(self, key, compute):
+        """Cached arrays for key, running compute() and storing its dict on a miss."""
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = compute()
+            self.put(key, arrays)
+        return arrays
+
+    def discard(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # already gone, e.g. evicted by another process sharing the cache
+
+    def entries(self):
+        """(key, size in bytes, last use) for every complete entry."""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            key = name[:-4]
+            data_path, sum_path = self._paths(key)
+            try:
+                stat = os.stat(data_path)
+                size = stat.st_size + os.path.getsize(sum_path)
+            except FileNotFoundError:
+                continue
+            found.append((key, size, stat.st_mtime))
+        return found
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def remove_leftovers(self, max_age=STALE_AFTER):
+        """Remove temporary files, and archives or sidecars without their partner, older than max_age."""
+        names = set(os.listdir(self.directory))
+        cutoff = time.time() - max_age
+        for name in names:
+            base, ext = os.path.splitext(name)
+            partner = {".npz": base + ".sha256", ".sha256": base + ".npz"}.get(ext)
+            if ext != ".tmp" and (partner is None or partner in names):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        self.remove_leftovers()
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.discard(key)
+            total -= size
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            self.discard(key)
+        self.remove_leftovers(max_age=0)
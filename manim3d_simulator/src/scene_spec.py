@@ -0,0 +1,331 @@
+import copy
+import hashlib
+import inspect
+import json
+import os
+import numpy as np
+from manim3d_simulator.src.source_set import SourceSet
+from manim3d_simulator.src.force_grid import ForceGrid
+from manim3d_simulator.src.engine import RayScene, TrajectoryEngine
+from manim3d_simulator.src.events import BoundingBox
+from manim3d_simulator.src.trajectory_store import TrajectoryStore, TrajectoryWriter
+
+# Sections that determine the simulated trajectories; only these enter the content hash
+PHYSICS_SECTIONS = ("sources", "generators", "lights", "physics", "termination")
+
+DEFAULT_PHYSICS = {
+    "drift_velocity": [0.0, 0.0, 0.0],
+    "force_scale": 0.1,
+    "integrator": "euler",
+    "dt": 1 / 120,
+    "duration": 20.0,
+    "rtol": 1e-6,
+    "atol": 1e-9,
+    "backend": "direct",
+    "theta": 0.5,
+    "force_grid": None,     # {"resolution": 96, "exact_radius": 2.0} to tabulate the field
+}
+DEFAULT_TERMINATION = {
+    "wall_y": None,
+    "stop_distance": None,
+    "domain": None,         # {"min": [x, y, z], "max": [x, y, z]}
+}
+DEFAULT_FORCE_GRID = {"resolution": 96, "exact_radius": 2.0}
+
+# Numeric settings that are counts or signs; every other number hashes as a float
+INTEGER_FIELDS = {"layers", "n", "n_x", "n_z", "charge", "resolution"}
+
+
+def ring_points(radius, coord, n, phase=0.0, axis="y"):
+    """(n, 3) evenly spaced points on a circle of given radius at a fixed axis coordinate."""
+    angles = phase + 2 * np.pi * np.arange(n) / n
+    a, b = radius * np.cos(angles), radius * np.sin(angles)
+    c = np.full(n, float(coord))
+    if axis == "y":
+        return np.column_stack([a, c, b])   # circle in XZ-plane at Y=coord
+    if axis == "x":
+        return np.column_stack([c, a, b])   # circle in YZ-plane at X=coord
+    return np.column_stack([a, b, c])       # circle in XY-plane at Z=coord
+
+
+def cone_generator(layers, y_start, y_step, r_base, r_top, mass, axis="y", inner_scale=0.85):
+    """
+    Cone of interleaved gravity / antigravity rings, base to tip (the multi_grav cone).
+    Yields (positions, mass, charge) groups.
+    """
+    for i in range(layers):
+        t = i / (layers - 1) if layers > 1 else 0.0
+        coord = y_start + i * y_step
+        r = r_base + (r_top - r_base) * t
+        # Points per ring proportional to radius (even number)
+        n = max(3, int(0.8 * r / 2) * 2)
+        yield ring_points(r, coord, n, phase=0.0, axis=axis), mass, 1
+        # Antigravity ring: slightly smaller radius + phase offset to interleave
+        yield ring_points(inner_scale * r, coord, n, phase=np.pi / n, axis=axis), mass, -1
+
+
+def ring_generator(radius, coord, n, mass, charge=1, phase=0.0, axis="y"):
+    yield ring_points(radius, coord, n, phase=phase, axis=axis), mass, charge
+
+
+SOURCE_GENERATORS = {
+    "cone": cone_generator,
+    "ring": ring_generator,
+}
+
+
+def _canonical(value, key=None):
+    """value with numbers cast to their field's type (int for INTEGER_FIELDS, else float)."""
+    if isinstance(value, dict):
+        return {k: _canonical(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v, key) for v in value]
+    if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+        return value
+    if key in INTEGER_FIELDS and float(value).is_integer():
+        return int(value)
+    return float(value)
+
+
+def outcome_counts(result):
+    """Rays per outcome of a result: each event name, plus "active" for rays still in flight."""
+    counts = {"active": int((result["hit_event"] < 0).sum())}
+    for index, name in enumerate(result["event_names"]):
+        counts[str(name)] = counts.get(str(name), 0) + int((result["hit_event"] == index).sum())
+    return counts
+
+
+class SceneSpec:
+    """
+    Declarative description of one simulation, loaded from JSON or TOML.
+
+    sources:      explicit [{"position": [x, y, z], "mass": m, "charge": +1 | -1}, ...]
+    generators:   [{"type": "cone" | "ring", ...keyword arguments of the generator}, ...]
+    lights:       {"type": "grid", "x_range", "z_range", "n_x", "n_z", "y"} or
+                  {"type": "points", "positions": [[x, y, z], ...]}
+    physics:      integrator settings, see DEFAULT_PHYSICS
+    termination:  wall_y, stop_distance and an optional bounding domain
+    render:       free-form settings for the Manim scenes (camera, trails, ...);
+                  not part of the content hash
+
+    content_hash() is the sha256 of the canonical JSON of the physics sections with
+    defaults filled in and numbers cast to their field's type (see normalized()), so
+    equivalent files hash alike and caches can key on it.
+    """
+
+    def __init__(self, data, path=None):
+        data = copy.deepcopy(dict(data))
+        self.name = data.get("name", "scene")
+        self.path = path
+        self.sources = list(data.get("sources", []))
+        self.generators = list(data.get("generators", []))
+        self.lights = dict(data.get("lights", {}))
+        self.physics = {**DEFAULT_PHYSICS, **data.get("physics", {})}
+        self.termination = {**DEFAULT_TERMINATION, **data.get("termination", {})}
+        self.render = dict(data.get("render", {}))
+        for generator in self.generators:
+            if generator.get("type") not in SOURCE_GENERATORS:
+                raise ValueError(f"Unknown source generator {generator.get('type')!r}, expected one of {tuple(SOURCE_GENERATORS)}")
+        if self.lights.get("type", "points") not in ("grid", "points"):
+            raise ValueError(f"Unknown light layout {self.lights.get('type')!r}, expected 'grid' or 'points'")
+
+    @classmethod
+    def load(cls, path):
+        """Read a .json or .toml scene file."""
+        path = os.fspath(path)
+        if path.endswith(".toml"):
+            import tomllib
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        return cls(data, path=path)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "sources": self.sources,
+            "generators": self.generators,
+            "lights": self.lights,
+            "physics": self.physics,
+            "termination": self.termination,
+            "render": self.render,
+        }
+
+    def normalized(self):
+        """
+        The physics sections with every default written out: source charges, generator
+        keyword defaults, the light layout type and force grid settings. Numbers are
+        cast by _canonical, so 20 and 20.0 compare equal.
+        """
+        sources = [{"charge": 1, **source} for source in self.sources]
+        generators = []
+        for generator in self.generators:
+            signature = inspect.signature(SOURCE_GENERATORS[generator["type"]])
+            defaults = {
+                name: parameter.default for name, parameter in signature.parameters.items()
+                if parameter.default is not inspect.Parameter.empty
+            }
+            generators.append({**defaults, **generator})
+        lights = {"type": "points", **self.lights}
+        if lights["type"] == "points":
+            lights.setdefault("positions", [])
+        physics = dict(self.physics)
+        if physics["force_grid"]:
+            physics["force_grid"] = {**DEFAULT_FORCE_GRID, **physics["force_grid"]}
+        sections = {
+            "sources": sources,
+            "generators": generators,
+            "lights": lights,
+            "physics": physics,
+            "termination": self.termination,
+        }
+        return _canonical({key: sections[key] for key in PHYSICS_SECTIONS})
+
+    def canonical_json(self):
+        return json.dumps(self.normalized(), sort_keys=True, separators=(",", ":"), allow_nan=False)
+
+    def content_hash(self):
+        return hashlib.sha256(self.canonical_json().encode("utf-8")).hexdigest()
+
+    def override(self, values):
+        """
+        Copy of this spec with individual settings replaced by dotted path, e.g.
+        {"generators.0.mass": 200, "physics.drift_velocity.1": 4.0}.
+        """
+        data = copy.deepcopy(self.to_dict())
+        for path, value in values.items():
+            target = data
+            keys = path.split(".")
+            for key in keys[:-1]:
+                target = target[int(key)] if isinstance(target, list) else target[key]
+            last = keys[-1]
+            if isinstance(target, list):
+                target[int(last)] = value
+            else:
+                target[last] = value
+        return SceneSpec(data, path=self.path)
+
+    def replace(self, **sections):
+        """Copy of this spec with top-level sections updated, e.g. replace(physics={"dt": 0.01})."""
+        data = self.to_dict()
+        for key, value in sections.items():
+            data[key] = {**data[key], **value} if isinstance(data.get(key), dict) else value
+        return SceneSpec(data, path=self.path)
+
+    def build_sources(self):
+        """SourceSet with the explicit sources followed by every generator's output."""
+        sources = SourceSet(backend=self.physics["backend"], theta=self.physics["theta"])
+        for source in self.sources:
+            sources.add(source["position"], source["mass"], charge=source.get("charge", 1))
+        for generator in self.generators:
+            kwargs = {key: value for key, value in generator.items() if key != "type"}
+            for positions, mass, charge in SOURCE_GENERATORS[generator["type"]](**kwargs):
+                sources.add(positions, mass, charge=charge)
+        return sources
+
+    def light_positions(self):
+        lights = self.lights
+        if lights.get("type", "points") == "points":
+            return np.asarray(lights.get("positions", []), dtype=np.float64).reshape(-1, 3)
+        xs = np.linspace(*lights["x_range"], lights["n_x"]) if lights["n_x"] > 1 else [np.mean(lights["x_range"])]
+        zs = np.linspace(*lights["z_range"], lights["n_z"]) if lights["n_z"] > 1 else [np.mean(lights["z_range"])]
+        return np.array([[x, lights["y"], z] for x in xs for z in zs], dtype=np.float64)
+
+    def build_field(self, sources, launch_positions):
+        """The sources themselves, or a ForceGrid over the scene box when physics.force_grid is set."""
+        grid = self.physics["force_grid"]
+        if not grid:
+            return sources
+        exact_radius = grid.get("exact_radius", DEFAULT_FORCE_GRID["exact_radius"])
+        domain = self.termination["domain"]
+        if domain:
+            lo, hi = np.asarray(domain["min"], dtype=np.float64), np.asarray(domain["max"], dtype=np.float64)
+        else:
+            corners = np.vstack([sources.positions, launch_positions])
+            margin = 2 * exact_radius
+            lo, hi = corners.min(axis=0) - margin, corners.max(axis=0) + margin
+        return ForceGrid(sources, lo, hi, resolution=grid.get("resolution", DEFAULT_FORCE_GRID["resolution"]), exact_radius=exact_radius)
+
+    def build_engine(self, sources=None, launch_positions=None, field=None):
+        """
+        TrajectoryEngine for this spec. launch_positions replaces the spec's lights and
+        field a prebuilt field, so batches of launches can share one SourceSet / ForceGrid.
+        """
+        sources = self.build_sources() if sources is None else sources
+        launch = self.light_positions() if launch_positions is None else launch_positions
+        termination = self.termination
+        events = []
+        if termination["domain"]:
+            events.append(BoundingBox(termination["domain"]["min"], termination["domain"]["max"]))
+        scene = RayScene(
+            self.build_field(sources, launch) if field is None else field,
+            launch,
+            drift_velocity=self.physics["drift_velocity"],
+            force_scale=self.physics["force_scale"],
+            events=events,
+            wall_y=termination["wall_y"],
+            stop_distance=termination["stop_distance"],
+        )
+        return TrajectoryEngine(
+            scene,
+            dt=self.physics["dt"],
+            method=self.physics["integrator"],
+            rtol=self.physics["rtol"],
+            atol=self.physics["atol"],
+        )
+
+    def simulate(self, engine=None):
+        """Run the whole scene; returns the engine (final state) and the (T, N, 3) trajectories."""
+        engine = self.build_engine() if engine is None else engine
+        return engine, engine.run_for(self.physics["duration"])
+
+    def result_arrays(self, engine, trajectories):
+        """Everything a renderer or analysis needs from one run, as plain arrays."""
+        return {
+            "trajectories": trajectories,
+            "hit_time": engine.hit_time,
+            "hit_position": engine.hit_position,
+            "hit_event": engine.hit_event,
+            "event_names": np.array([event.name for event in engine.scene.events]),
+            "dt": np.float64(engine.dt),
+            "content_hash": np.array(self.content_hash()),
+        }
+
+    def record(self, path, dtype="float64", checkpoint=None, resume=False, engine=None):
+        """
+        Simulate straight into a trajectory store file, offering checkpoint (a
+        checkpoint.Checkpointer) the state as it goes. With resume and an existing
+        store, the run continues from the newest checkpoint; the store may run ahead
+        of it, and everything after it is recomputed. Returns (engine, the checkpoint
+        resumed from or None).
+        """
+        engine = self.build_engine() if engine is None else engine
+        metadata = {"name": self.name, "content_hash": self.content_hash()}
+        resumed = resume and os.path.exists(path) and checkpoint.restore(engine) or None
+        with TrajectoryWriter(path, len(engine.positions), engine.dt, dtype=dtype, metadata=metadata,
+                              append=bool(resumed)) as writer:
+            if resumed:
+                writer.truncate(engine.step_index + 1)
+            engine.record_for(writer, self.physics["duration"], checkpoint=checkpoint)
+        return engine, resumed
+
+    def result(self, cache=None, sources=None, checkpoint=None):
+        """
+        result_arrays() of a full run, loaded from a ResultCache when one is given
+        and it already holds this spec's content hash. With a checkpoint the run is
+        recorded into a store next to the checkpoints and resumes from the newest
+        one, so an interrupted render picks up where it stopped.
+        """
+        def compute():
+            engine = self.build_engine(sources)
+            if checkpoint is None:
+                return self.result_arrays(*self.simulate(engine))
+            store = os.path.join(checkpoint.directory, f"{checkpoint.prefix}_trajectories.dctraj")
+            engine, _ = self.record(store, checkpoint=checkpoint, resume=True, engine=engine)
+            return self.result_arrays(engine, TrajectoryStore(store).read())
+
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(cache.key(self.content_hash()), compute)
@@ -0,0 +1,158 @@
+import numpy as np
+from manim3d_simulator.src.force_kernel import direct_accelerations, direct_potentials, stack_sources
+from manim3d_simulator.src.octree import BarnesHutTree
+
+FORCE_BACKENDS = ("direct", "octree")
+
+
+class SourceSet:
+    """
+    Struct-of-arrays store for every gravity (+1) and antigravity (-1) source in a scene.
+
+    Positions, masses and charge signs live in contiguous arrays so the force loop
+    never touches Manim objects. Visual spheres (GravitySource3D / AntiGravitySource3D,
+    or anything with set_position) can be bound per source and are synced from here.
+
+    backend selects how the field is summed: "direct" (exact, O(N*M)) or "octree"
+    (Barnes-Hut, O(N log M), opening angle theta).
+    """
+
+    def __init__(self, capacity=64, backend="direct", theta=0.5):
+        self.theta = float(theta)
+        self.set_backend(backend)
+        capacity = max(1, int(capacity))
+        self._positions = np.zeros((capacity, 3), dtype=np.float64)
+        self._masses = np.zeros(capacity, dtype=np.float64)
+        self._charges = np.zeros(capacity, dtype=np.int8)
+        self._size = 0
+        self._visuals = [None] * capacity
+        self._dirty = np.zeros(capacity, dtype=bool)  # moved since the last sync
+
+    @classmethod
+    def from_sources(cls, *source_groups):
+        """Build a SourceSet from existing lists of GravitySource3D / AntiGravitySource3D."""
+        sources = [src for group in source_groups for src in group]
+        positions, signed_masses = stack_sources(sources)
+        source_set = cls(capacity=len(sources))
+        source_set.add(positions, np.abs(signed_masses), np.sign(signed_masses))
+        source_set.bind_visuals(np.arange(len(sources)), sources)
+        return source_set
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def positions(self):
+        return self._positions[:self._size]
+
+    @property
+    def masses(self):
+        return self._masses[:self._size]
+
+    @property
+    def charges(self):
+        return self._charges[:self._size]
+
+    @property
+    def signed_masses(self):
+        return self.charges * self.masses
+
+    def set_backend(self, backend, theta=None):
+        if backend not in FORCE_BACKENDS:
+            raise ValueError(f"Unknown force backend {backend!r}, expected one of {FORCE_BACKENDS}")
+        self.backend = backend
+        if theta is not None:
+            self.theta = float(theta)
+        self._tree = None
+
+    def tree(self):
+        """Barnes-Hut tree over the current sources, rebuilt lazily after any change."""
+        if self._tree is None or self._tree.theta != self.theta:
+            self._tree = BarnesHutTree(self.positions, self.signed_masses, theta=self.theta)
+        return self._tree
+
+    def _reserve(self, size):
+        if size <= len(self._masses):
+            return
+        capacity = max(size, 2 * len(self._masses))
+        extra = capacity - len(self._masses)
+        self._positions = np.concatenate([self._positions, np.zeros((extra, 3))])
+        self._masses = np.concatenate([self._masses, np.zeros(extra)])
+        self._charges = np.concatenate([self._charges, np.zeros(extra, dtype=np.int8)])
+        self._dirty = np.concatenate([self._dirty, np.zeros(extra, dtype=bool)])
+        self._visuals.extend([None] * extra)
+
+    def add(self, positions, masses, charge=1):
+        """
+        Append sources in bulk. masses and charge may be scalars or per-source arrays.
+        Returns the indices of the new sources.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        count = len(positions)
+        start, stop = self._size, self._size + count
+        self._reserve(stop)
+
+        self._positions[start:stop] = positions
+        self._masses[start:stop] = masses
+        self._charges[start:stop] = np.sign(charge)
+        self._dirty[start:stop] = True
+        self._size = stop
+        self._tree = None
+        return np.arange(start, stop)
+
+    def remove(self, indices):
+        """
+        Remove sources in bulk, keeping the arrays contiguous (later indices shift down).
+        Returns the visuals that were bound to the removed sources so the scene can drop them.
+        """
+        keep = np.ones(self._size, dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        removed_visuals = [v for v, k in zip(self._visuals[:self._size], keep) if not k and v is not None]
+
+        count = int(keep.sum())
+        self._positions[:count] = self._positions[:self._size][keep]
+        self._masses[:count] = self._masses[:self._size][keep]
+        self._charges[:count] = self._charges[:self._size][keep]
+        self._dirty[:count] = self._dirty[:self._size][keep]
+        self._visuals[:count] = [v for v, k in zip(self._visuals[:self._size], keep) if k]
+        self._visuals[count:self._size] = [None] * (self._size - count)
+        self._size = count
+        self._tree = None
+        return removed_visuals
+
+    def _resolve(self, indices):
+        # Negative indices count from the last live source, not from the end of the capacity
+        indices = np.asarray(indices, dtype=np.intp)
+        if np.any((indices < -self._size) | (indices >= self._size)):
+            raise IndexError(f"source index out of range for {self._size} sources")
+        return np.where(indices < 0, indices + self._size, indices)
+
+    def move(self, indices, positions):
+        """Move sources in bulk; bound visuals follow on the next sync_visuals()."""
+        indices = self._resolve(indices)
+        self._positions[indices] = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self._dirty[indices] = True
+        self._tree = None
+
+    def accelerations(self, points):
+        """Net field of every source at each point; see force_kernel.direct_accelerations."""
+        if self.backend == "octree":
+            return self.tree().accelerations(points)
+        return direct_accelerations(points, self.positions, self.signed_masses)
+
+    def potentials(self, points):
+        """Exact potential at each point, for energy diagnostics."""
+        return direct_potentials(points, self.positions, self.signed_masses)
+
+    def bind_visuals(self, indices, visuals):
+        for index, visual in zip(self._resolve(indices), visuals):
+            self._visuals[index] = visual
+            self._dirty[index] = True
+
+    def sync_visuals(self):
+        """Push positions of sources moved since the last sync onto their visuals."""
+        for index in np.flatnonzero(self._dirty[:self._size]):
+            visual = self._visuals[index]
+            if visual is not None:
+                visual.set_position(self._positions[index].copy())
+        self._dirty[:self._size] = False
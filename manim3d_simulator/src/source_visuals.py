@@ -0,0 +1,92 @@
+from manim import *
+import numpy as np
+from manim3d_simulator.control_panel import ControlPanel as cp
+
+SOURCE_VISUAL_MODES = ("full", "lowpoly", "merged")
+
+# One tessellated sphere per (radius, color, resolution); sources get copies of it
+_SPHERE_TEMPLATES = {}
+
+
+def source_sphere(radius, color, mode=None):
+    """
+    Sphere for one source, copied from a shared template instead of re-tessellated.
+
+    "full" keeps Manim's default resolution, the other modes use
+    cp.SOURCE_SPHERE_RESOLUTION. The template sits at the origin.
+    """
+    mode = cp.SOURCE_VISUAL_MODE if mode is None else mode
+    if mode not in SOURCE_VISUAL_MODES:
+        raise ValueError(f"Unknown source visual mode {mode!r}, expected one of {SOURCE_VISUAL_MODES}")
+    resolution = None if mode == "full" else tuple(cp.SOURCE_SPHERE_RESOLUTION)
+    key = (float(radius), str(ManimColor(color)), resolution)
+    template = _SPHERE_TEMPLATES.get(key)
+    if template is None:
+        template = Sphere(
+            radius=radius,
+            resolution=resolution,
+            color=color,
+            fill_opacity=0.5,
+            stroke_color=color,
+        )
+        _SPHERE_TEMPLATES[key] = template
+    return template.copy()
+
+
+class MergedSourceCloud(PMobject):
+    """
+    Every static source of a SourceSet drawn as one colored point mobject.
+
+    Hundreds of cone sources become a single draw call instead of one sphere
+    mesh each. handle(i) gives a per-source object with set_position, so the
+    cloud binds to SourceSet.bind_visuals like the sphere visuals do.
+    """
+
+    class _Handle:
+        def __init__(self, cloud, index):
+            self.cloud = cloud
+            self.index = index
+
+        def set_position(self, position):
+            self.cloud.points[self.index] = position
+
+    def __init__(self, positions, charges, stroke_width=None, **kwargs):
+        super().__init__(stroke_width=cp.SOURCE_POINT_SIZE if stroke_width is None else stroke_width, **kwargs)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        colors = np.where(
+            np.asarray(charges)[:, None] > 0,
+            color_to_rgba(cp.GRAVITY_SOURCE_COLOR),
+            color_to_rgba(cp.ANTIGRAVITY_SOURCE_COLOR),
+        )
+        self.add_points(positions, rgbas=colors)
+
+    def handle(self, index):
+        return MergedSourceCloud._Handle(self, index)
+
+
+def build_source_visuals(sources, mode=None):
+    """
+    Create and bind the visuals of every source in a SourceSet.
+
+    Returns the mobjects to add to the scene: one sphere per source for "full" and
+    "lowpoly", a single MergedSourceCloud for "merged".
+    """
+    # Imported here because the source classes import source_sphere from this module
+    from manim3d_simulator.src.gravity_source3d import GravitySource3D as gs3d
+    from manim3d_simulator.src.antigravity_source3d import AntiGravitySource3D as as3d
+
+    mode = cp.SOURCE_VISUAL_MODE if mode is None else mode
+    indices = np.arange(len(sources))
+    if mode == "merged":
+        cloud = MergedSourceCloud(sources.positions, sources.charges)
+        sources.bind_visuals(indices, [cloud.handle(i) for i in indices])
+        sources.sync_visuals()
+        return [cloud]
+
+    visuals = [
+        gs3d(mass, pos, mode=mode) if charge > 0 else as3d(mass, pos, mode=mode)
+        for pos, mass, charge in zip(sources.positions, sources.masses, sources.charges)
+    ]
+    sources.bind_visuals(indices, visuals)
+    sources.sync_visuals()
+    return visuals
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class TrailBuffer:
+    """
+    Preallocated ring buffer holding the recent path of every ray.
+
+    Samples live in one (N, capacity, 3) array; each append writes one (N, 3)
+    column at the rays' own write heads, so memory is fixed however long the
+    scene runs and the oldest samples are overwritten once a trail is full.
+    Only every decimation-th append is stored. Rays whose position has not
+    changed since their last stored sample (retired rays) are skipped, which
+    keeps their trail intact instead of collapsing it onto the stop point.
+    capacity=None grows the buffer instead of capping it.
+    """
+
+    def __init__(self, n_rays, capacity=1024, decimation=1):
+        self.n_rays = int(n_rays)
+        self.capacity = None if capacity is None else max(2, int(capacity))
+        self.decimation = max(1, int(decimation))
+        self.data = np.zeros((self.n_rays, self.capacity or 64, 3))
+        self.head = np.zeros(self.n_rays, dtype=np.intp)    # next slot to write
+        self.count = np.zeros(self.n_rays, dtype=np.intp)   # stored samples, <= capacity
+        self.dirty = np.zeros(self.n_rays, dtype=bool)      # changed since last clean()
+        self._calls = 0
+
+    def __len__(self):
+        return self.n_rays
+
+    def clear(self):
+        self.head[:] = 0
+        self.count[:] = 0
+        self.dirty[:] = True
+        self._calls = 0
+
+    def last(self):
+        """(N, 3) most recent stored sample per ray (zeros for empty trails)."""
+        return self.data[np.arange(self.n_rays), (self.head - 1) % self.data.shape[1]]
+
+    def append(self, positions, force=False):
+        """
+        Record an (N, 3) sample; returns the ray indices that were written.
+        force stores the sample even when it falls between decimated steps.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(self.n_rays, 3)
+        call = self._calls
+        self._calls += 1
+        if not force and call % self.decimation:
+            return np.zeros(0, dtype=np.intp)
+
+        moved = (self.count == 0) | (positions != self.last()).any(axis=1)
+        rays = np.flatnonzero(moved)
+        if len(rays) == 0:
+            return rays
+        if self.capacity is None and self.count[rays].max() >= self.data.shape[1]:
+            # Unbounded: nothing has been overwritten, so the samples stay where they are
+            grown = np.zeros((self.n_rays, 2 * self.data.shape[1], 3))
+            grown[:, :self.data.shape[1]] = self.data
+            self.data = grown
+            self.head[:] = self.count
+
+        size = self.data.shape[1]
+        self.data[rays, self.head[rays]] = positions[rays]
+        self.head[rays] = (self.head[rays] + 1) % size
+        self.count[rays] = np.minimum(self.count[rays] + 1, size)
+        self.dirty[rays] = True
+        return rays
+
+    def ray(self, i):
+        """(count, 3) stored samples of ray i, oldest first."""
+        count, head = self.count[i], self.head[i]
+        if count < self.data.shape[1]:
+            return self.data[i, :count]
+        return np.concatenate([self.data[i, head:], self.data[i, :head]])
+
+    def clean(self):
+        """Return the rays changed since the previous call and reset the flags."""
+        rays = np.flatnonzero(self.dirty)
+        self.dirty[:] = False
+        return rays
@@ -0,0 +1,59 @@
+from manim import *
+import numpy as np
+from manim3d_simulator.src.light_cloud import LightCloud
+from manim3d_simulator.src.trajectory_store import TrajectoryStore
+
+
+class TrajectoryPlayback(Group):
+    """
+    Plays a precomputed (T, N, 3) trajectory array back onto N light mobjects,
+    or onto a single LightCloud holding all N lights. trajectories may also be a
+    TrajectoryStore, which is played straight from its memory map without loading it.
+
+    A single updater advances the playback clock by the frame dt and moves each
+    light to its position at that time, linearly interpolated between the stored
+    steps (spaced dt_physics apart). No force code runs while rendering, so a
+    re-render at another resolution, frame rate or camera angle is pure drawing.
+    """
+
+    def __init__(self, trajectories, lights, dt_physics, **kwargs):
+        self.cloud = lights if isinstance(lights, LightCloud) else None
+        self.lights = [lights] if self.cloud is not None else list(lights)
+        super().__init__(*self.lights, **kwargs)
+        if isinstance(trajectories, TrajectoryStore):
+            self.trajectories = trajectories.array
+        else:
+            self.trajectories = np.asarray(trajectories, dtype=np.float64)
+        self.dt_physics = float(dt_physics)
+        self.elapsed = 0.0
+        self._shown = np.array(self.trajectories[0], dtype=np.float64)
+        if self.cloud is not None:
+            self.cloud.set_positions(self._shown)
+        else:
+            for light, pos in zip(self.lights, self._shown):
+                light.move_to(pos)
+        self.add_updater(self._update_lights)
+
+    @property
+    def duration(self):
+        return (len(self.trajectories) - 1) * self.dt_physics
+
+    def positions_at(self, t):
+        """(N, 3) positions at playback time t, clamped to the stored range."""
+        index = np.clip(t / self.dt_physics, 0, len(self.trajectories) - 1)
+        lo = int(np.floor(index))
+        hi = min(lo + 1, len(self.trajectories) - 1)
+        alpha = index - lo
+        return (1 - alpha) * self.trajectories[lo] + alpha * self.trajectories[hi]
+
+    def _update_lights(self, mob, dt):
+        self.elapsed += dt
+        positions = self.positions_at(self.elapsed)
+        if self.cloud is not None:
+            self.cloud.set_positions(positions)
+            self._shown = positions
+            return
+        # Only lights that actually moved (retired rays are frozen in the array)
+        for i in np.flatnonzero((positions != self._shown).any(axis=1)):
+            self.lights[i].move_to(positions[i])
+        self._shown = positions
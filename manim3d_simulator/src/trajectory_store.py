@@ -0,0 +1,194 @@
+import json
+import os
+import numpy as np
+
+# File layout: a fixed HEADER_SIZE block (magic + space-padded JSON metadata), then the
+# positions as one step-major (steps, n_rays, 3) array, appended a chunk of steps at a
+# time. The header is rewritten in place after every chunk, so a reader always sees a
+# consistent prefix of the run, even while the writer is still going or after a crash.
+MAGIC = b"DCTRAJ01"
+HEADER_SIZE = 4096
+DEFAULT_CHUNK_STEPS = 256
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        block = f.read(HEADER_SIZE)
+    if len(block) < HEADER_SIZE or not block.startswith(MAGIC):
+        raise ValueError(f"{path} is not a trajectory store")
+    return json.loads(block[len(MAGIC):].decode("utf-8"))
+
+
+def _write_header(f, header):
+    payload = MAGIC + json.dumps(header, sort_keys=True).encode("utf-8")
+    if len(payload) > HEADER_SIZE:
+        raise ValueError("trajectory store metadata does not fit in the header")
+    f.seek(0)
+    f.write(payload.ljust(HEADER_SIZE, b" "))
+
+
+class TrajectoryWriter:
+    """
+    Appends ray positions to a trajectory store file while a run is in progress.
+
+    Steps are buffered in memory and written a chunk of chunk_steps at a time, so
+    memory stays at one chunk however long the run is. dtype float32 halves the file
+    for playback; keep float64 for analysis that needs the full precision.
+    append=True continues an existing store (e.g. after resuming a checkpoint); its
+    ray count, dtype and dt must match the writer's.
+    """
+
+    def __init__(self, path, n_rays, dt, dtype="float32", chunk_steps=DEFAULT_CHUNK_STEPS,
+                 metadata=None, append=False):
+        self.path = os.fspath(path)
+        self.chunk_steps = max(1, int(chunk_steps))
+        if append and os.path.exists(self.path):
+            self.header = _read_header(self.path)
+            if self.header["n_rays"] != int(n_rays):
+                raise ValueError(f"{self.path} holds {self.header['n_rays']} rays, not {n_rays}")
+            if self.header["dtype"] != np.dtype(dtype).name:
+                raise ValueError(f"{self.path} holds {self.header['dtype']} positions, not {np.dtype(dtype).name}")
+            if self.header["dt"] != float(dt):
+                raise ValueError(f"{self.path} was recorded with dt={self.header['dt']}, not {float(dt)}")
+            self._file = open(self.path, "r+b")
+            # Drop a torn partial step left by an interrupted write
+            self._file.truncate(HEADER_SIZE + self.header["steps"] * self._step_bytes)
+        else:
+            self.header = {
+                "n_rays": int(n_rays),
+                "dtype": np.dtype(dtype).name,
+                "dt": float(dt),
+                "steps": 0,
+                "metadata": dict(metadata or {}),
+            }
+            self._file = open(self.path, "w+b")
+            _write_header(self._file, self.header)
+        self.dtype = np.dtype(self.header["dtype"])
+        self._buffer = np.empty((self.chunk_steps, self.header["n_rays"], 3), dtype=self.dtype)
+        self._buffered = 0
+
+    @property
+    def _step_bytes(self):
+        return self.header["n_rays"] * 3 * np.dtype(self.header["dtype"]).itemsize
+
+    @property
+    def steps(self):
+        """Steps recorded so far, including those still buffered."""
+        return self.header["steps"] + self._buffered
+
+    def append(self, positions):
+        """Record one (N, 3) step or a (k, N, 3) block of steps."""
+        positions = np.asarray(positions)
+        if positions.ndim == 2:
+            positions = positions[None]
+        for step in positions:
+            self._buffer[self._buffered] = step
+            self._buffered += 1
+            if self._buffered == self.chunk_steps:
+                self.flush()
+
+    def flush(self):
+        """Write buffered steps and publish them in the header."""
+        if self._buffered:
+            self._file.seek(HEADER_SIZE + self.header["steps"] * self._step_bytes)
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self.header["steps"] += self._buffered
+            self._buffered = 0
+            # Data first, then the header that makes it visible
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            _write_header(self._file, self.header)
+        self._file.flush()
+
+    def truncate(self, steps):
+        """Drop every step from index steps on, e.g. those recorded after a resumed checkpoint."""
+        self.flush()
+        if steps > self.header["steps"]:
+            raise ValueError(f"{self.path} holds only {self.header['steps']} steps, cannot keep {steps}")
+        self.header["steps"] = int(steps)
+        _write_header(self._file, self.header)
+        self._file.truncate(HEADER_SIZE + self.header["steps"] * self._step_bytes)
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryStore:
+    """
+    Read-only view of a trajectory store file through np.memmap.
+
+    Nothing is loaded up front: read() and positions_at() touch only the steps and
+    rays they return, and iter_chunks() streams a run of any size in bounded memory.
+    refresh() picks up steps appended by a writer since the store was opened.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.refresh()
+
+    def refresh(self):
+        self.header = _read_header(self.path)
+        self.n_rays = self.header["n_rays"]
+        self.dt = self.header["dt"]
+        self.dtype = np.dtype(self.header["dtype"])
+        self.metadata = self.header["metadata"]
+        # Trust only steps that are both published and fully on disk
+        step_bytes = self.n_rays * 3 * self.dtype.itemsize
+        on_disk = (os.path.getsize(self.path) - HEADER_SIZE) // step_bytes if step_bytes else 0
+        self.steps = int(min(self.header["steps"], on_disk))
+        if self.steps:
+            self.array = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER_SIZE,
+                                   shape=(self.steps, self.n_rays, 3))
+        else:
+            self.array = np.zeros((0, self.n_rays, 3), dtype=self.dtype)
+        return self
+
+    def __len__(self):
+        return self.steps
+
+    @property
+    def duration(self):
+        return max(self.steps - 1, 0) * self.dt
+
+    def step_range(self, start_time=None, end_time=None):
+        """[first, stop) step indices covering the time range, clamped to the recording."""
+        first = 0 if start_time is None else int(np.floor(start_time / self.dt + 1e-9))
+        stop = self.steps if end_time is None else int(np.floor(end_time / self.dt + 1e-9)) + 1
+        return max(first, 0), min(stop, self.steps)
+
+    def read(self, start_time=None, end_time=None, rays=None, stride=1):
+        """(T, R, 3) float64 positions for the time range and ray subset (all rays by default)."""
+        first, stop = self.step_range(start_time, end_time)
+        block = self.array[first:stop:stride]
+        if rays is not None:
+            block = block[:, np.asarray(rays)]
+        return np.array(block, dtype=np.float64)
+
+    def positions_at(self, t, rays=None):
+        """(R, 3) positions at time t, linearly interpolated between stored steps."""
+        if self.steps == 0:
+            raise ValueError(f"{self.path} holds no steps yet")
+        index = np.clip(t / self.dt, 0, self.steps - 1)
+        lo = int(np.floor(index))
+        hi = min(lo + 1, self.steps - 1)
+        alpha = index - lo
+        rows = slice(None) if rays is None else np.asarray(rays)
+        return (1 - alpha) * self.array[lo, rows].astype(np.float64) + alpha * self.array[hi, rows].astype(np.float64)
+
+    def iter_chunks(self, chunk_steps=DEFAULT_CHUNK_STEPS, rays=None):
+        """Yield (first_step, (k, R, 3) block) pairs over the whole recording."""
+        for first in range(0, self.steps, chunk_steps):
+            block = self.array[first:first + chunk_steps]
+            if rays is not None:
+                block = block[:, np.asarray(rays)]
+            yield first, np.array(block, dtype=np.float64)
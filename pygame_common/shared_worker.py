@@ -0,0 +1,205 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+MAX_BATCH_STEPS = 16   # steps between two publishes of the worker
+IDLE_WAIT = 0.01       # seconds the worker sleeps while paused or finished
+ALIGNMENT = 64
+
+
+def _aligned(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class SharedState:
+    """
+    One shared-memory block of named numpy arrays behind a sequence lock.
+
+    layout maps names to (shape, dtype). The creating process owns the block and
+    unlinks it on close(); another process attaches by passing spec() back in.
+    Writes made inside writing() are published together: the sequence counter is odd
+    while they happen, and read() returns None instead of waiting when it catches
+    one half-way, so the reader keeps its previous snapshot. Arrays that are only
+    appended to can be written outside the lock and published by a length counter.
+    """
+
+    def __init__(self, layout, name=None):
+        self.layout = {key: (tuple(shape), np.dtype(dtype).str) for key, (shape, dtype) in layout.items()}
+        sizes = [ALIGNMENT] + [
+            _aligned(int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize)
+            for shape, dtype in self.layout.values()
+        ]
+        offsets = np.cumsum([0] + sizes)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=int(offsets[-1]))
+        self._seq = np.ndarray((), np.int64, self.shm.buf, 0)
+        self.arrays = {
+            key: np.ndarray(shape, dtype, self.shm.buf, int(offset))
+            for (key, (shape, dtype)), offset in zip(self.layout.items(), offsets[1:])
+        }
+        if self.owner:
+            self._seq[()] = 0
+
+    def spec(self):
+        """Arguments that attach another process to this block."""
+        return self.layout, self.shm.name
+
+    @property
+    def seq(self):
+        return int(self._seq)
+
+    def writing(self):
+        """Context manager yielding the arrays, published when the block exits."""
+        return _SeqWrite(self)
+
+    def read(self, copy):
+        """copy(arrays) taken under the lock, or None if a write was in progress."""
+        seq = self.seq
+        if seq % 2:
+            return None
+        result = copy(self.arrays)
+        if self.seq != seq:
+            return None
+        return result
+
+    def close(self):
+        # The numpy views must go before the buffer they export can be released
+        self._seq = self.arrays = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _SeqWrite:
+    def __init__(self, state):
+        self.state = state
+
+    def __enter__(self):
+        self.state._seq[()] += 1
+        return self.state.arrays
+
+    def __exit__(self, *exc):
+        self.state._seq[()] += 1
+
+
+class Simulation:
+    """
+    What a SimulationWorker runs. It is built in the parent process and a copy is
+    stepped in the worker, so it must pickle.
+
+    layout():               SharedState arrays the simulation publishes
+    publish(state):         write the current state into the shared arrays
+    advance(steps, state):  run up to steps steps, then publish
+    finished():             True once there is nothing left to step
+    command(name, value):   apply a setting sent with SimulationWorker.send
+    read(state):            snapshot of the shared arrays, None if a write was in progress
+    """
+
+    steps = 0
+
+    def finished(self):
+        return False
+
+    def command(self, name, value):
+        raise ValueError(f"Unknown worker command {name!r}")
+
+
+def _worker_main(spec, simulation, steps_per_second, commands, stop_event):
+    state = SharedState(*spec)
+    paused = False
+    # Pacing reference: steps_per_second is measured from (anchor_time, anchor_steps)
+    anchor_time, anchor_steps = time.perf_counter(), simulation.steps
+    try:
+        while not stop_event.is_set():
+            while True:
+                try:
+                    command, value = commands.get_nowait()
+                except queue.Empty:
+                    break
+                if command == "pause":
+                    paused = value
+                elif command == "rate":
+                    steps_per_second = value
+                else:
+                    simulation.command(command, value)
+                anchor_time, anchor_steps = time.perf_counter(), simulation.steps
+
+            if paused or simulation.finished():
+                stop_event.wait(IDLE_WAIT)
+                anchor_time, anchor_steps = time.perf_counter(), simulation.steps
+                continue
+
+            batch = MAX_BATCH_STEPS
+            if steps_per_second:
+                due = anchor_steps + int((time.perf_counter() - anchor_time) * steps_per_second) - simulation.steps
+                if due <= 0:
+                    stop_event.wait(min(IDLE_WAIT, 1 / steps_per_second))
+                    continue
+                if due > MAX_BATCH_STEPS:
+                    # Falling behind the requested rate: drop the backlog instead of catching up
+                    anchor_time, anchor_steps = time.perf_counter(), simulation.steps + MAX_BATCH_STEPS
+                batch = min(due, MAX_BATCH_STEPS)
+            simulation.advance(batch, state)
+    finally:
+        state.close()
+
+
+class SimulationWorker:
+    """
+    Runs a Simulation in a separate process, so the physics is neither capped by nor
+    slowing down the render loop.
+
+    The worker publishes through a SharedState and snapshot() returns the latest
+    consistent copy without blocking. steps_per_second paces the simulation
+    independently of the frame rate; None runs it as fast as possible. close() must
+    run even when the render loop raises, or the worker and its shared block outlive
+    the window.
+    """
+
+    def __init__(self, simulation, steps_per_second=None):
+        self.simulation = simulation
+        self.state = SharedState(simulation.layout())
+        simulation.publish(self.state)
+        self.commands = mp.Queue()
+        self.stop_event = mp.Event()
+        self.process = mp.Process(
+            target=_worker_main,
+            args=(self.state.spec(), simulation, steps_per_second, self.commands, self.stop_event),
+            daemon=True,
+        )
+        self._seq = self.state.seq
+        self._snapshot = simulation.read(self.state)
+
+    def start(self):
+        self.process.start()
+
+    def send(self, command, value):
+        self.commands.put((command, value))
+
+    def pause(self, paused=True):
+        self.send("pause", paused)
+
+    def set_rate(self, steps_per_second):
+        """Target simulation steps per second; None for as fast as possible."""
+        self.send("rate", steps_per_second)
+
+    def snapshot(self):
+        """Latest published state; the previous one if the worker is mid-write or idle."""
+        seq = self.state.seq
+        if seq != self._seq:
+            snapshot = self.simulation.read(self.state)
+            if snapshot is not None:
+                self._snapshot, self._seq = snapshot, seq
+        return self._snapshot
+
+    def close(self):
+        self.stop_event.set()
+        if self.process.is_alive():
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.commands.cancel_join_thread()
+        self._snapshot = None
+        self.state.close()